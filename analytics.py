@@ -0,0 +1,268 @@
+"""
+분석 헬퍼 — 데이터셋 단위로 한 번 계산해 캐시해 두는 파생 정보
+"""
+import numpy as np
+import pandas as pd
+
+
+def trading_calendar(ohlc_df):
+    """지수의 거래일 인덱스 (종가가 있는 날만, 정렬 · 중복 제거)"""
+    idx = ohlc_df.index[ohlc_df["Close"].notna().to_numpy()]
+    return idx.unique().sort_values()
+
+
+def calendar_key(calendar):
+    """거래일 인덱스 지문 — 같은 거래소 달력을 쓰는 지수끼리 정렬 결과를 공유하는 캐시 키"""
+    return int(pd.util.hash_pandas_object(calendar, index=False).sum())
+
+
+def asof_align(series_df, calendar):
+    """저빈도 시계열(주간/월간 FRED)을 거래일 인덱스에 as-of 결합 — 각 거래일에 그 인덱스 날짜까지의 마지막 값
+
+    합집합 인덱스 + ffill과 달리 행이 거래일뿐이라 pct_change(252) · rolling(90)이 거래일 수를 셉니다.
+    """
+    left = pd.DataFrame(index=pd.DatetimeIndex(calendar, name=None))
+    right = series_df.sort_index()
+    right.index = right.index.as_unit(left.index.unit)
+    return pd.merge_asof(left, right, left_index=True, right_index=True)
+
+
+def release_dated(series_df, lag):
+    """관측일 기준 시계열 → 발표일 기준 (인덱스를 발표 시차만큼 뒤로)
+
+    FRED 값은 관측일로 찍혀 있으므로, as-of 결합 전에 적용해야 각 거래일에 그날까지 실제로 발표된 값이 붙습니다.
+    """
+    return series_df.set_axis(series_df.index + lag)
+
+
+def build_frame(fred_aligned, ohlc, liq_divisor, engine, columns, keep_from, compact=(), dtype="float32"):
+    """거래일에 정렬된 FRED + 지수 OHLC → (결합 프레임, 표시 구간 OHLC)
+
+    파생 컬럼(columns)은 증분 엔진이 새 봉만 반영하고, keep_from 이전은 잘라냅니다.
+    compact 컬럼만 dtype으로 줄이고 나머지(원천 · KPI 컬럼)는 float64 그대로 둡니다.
+    """
+    df = fred_aligned.assign(Liquidity=fred_aligned["Liquidity"] / liq_divisor,
+                             SP500=ohlc["Close"].reindex(fred_aligned.index))
+    df = pd.concat([df, engine.update(df[["Liquidity", "SP500"]], columns)], axis=1)
+    keep_from = pd.Timestamp(keep_from)
+    df = df[df.index >= keep_from]
+    ohlc = ohlc[ohlc.index >= keep_from]
+    return df.dropna(subset=["SP500"]).astype(dict.fromkeys(compact, dtype)), ohlc.dropna(subset=["Close"])
+
+
+def regime_spans(flag, max_gap_days=5):
+    """0/1 국면 시리즈 → 연속 구간 [start, end] 표 (run-length encoding)
+
+    활성일 사이 간격이 max_gap_days 이하이면 같은 구간으로 묶습니다.
+    경기침체뿐 아니라 다른 국면 음영에도 그대로 사용합니다.
+    """
+    active = flag.index[flag.to_numpy() == 1]
+    if active.empty:
+        return pd.DataFrame({"start": pd.DatetimeIndex([]), "end": pd.DatetimeIndex([])})
+    breaks = np.diff(active.to_numpy()) > np.timedelta64(max_gap_days, "D")
+    starts = active[np.r_[True, breaks]]
+    ends = active[np.r_[breaks, True]]
+    return pd.DataFrame({"start": starts, "end": ends})
+
+
+def clip_spans(spans, lo, hi):
+    """[lo, hi] 구간과 겹치는 부분만 남기고 경계를 잘라냄"""
+    keep = (spans["end"] >= lo) & (spans["start"] <= hi)
+    spans = spans[keep]
+    return spans.assign(start=spans["start"].clip(lower=lo), end=spans["end"].clip(upper=hi))
+
+
+# ── 선행·후행 상관 곡면 ──
+LEAD_LAG_WINDOWS = tuple(range(30, 253, 6))   # 롤링 창 (거래일)
+LEAD_LAG_LAGS = tuple(range(-120, 121, 4))    # 시차 (거래일, 양수 = 유동성이 선행)
+
+
+def _windowed(cs, w):
+    """누적합 (…, n+1) → 길이 w 창 합 (…, n-w+1)"""
+    return cs[..., w:] - cs[..., :-w]
+
+
+def _pair_cumsums(x, y):
+    """x, y (…, n) → 두 값 모두 유효한 쌍의 개수 · Σx · Σy · Σx² · Σy² · Σxy 누적합 (…, n+1)
+
+    큰 수의 제곱합에서 생기는 상쇄 오차를 줄이려면 평균을 뺀 x, y를 넘깁니다.
+    """
+    ok = ~(np.isnan(x) | np.isnan(y))
+    dx, dy = np.where(ok, x, 0.0), np.where(ok, y, 0.0)
+    pad = np.zeros(x.shape[:-1] + (1,))
+    return {k: np.concatenate([pad, np.cumsum(v, axis=-1)], axis=-1)
+            for k, v in {"n": ok.astype(float), "x": dx, "y": dy,
+                         "xx": dx * dx, "yy": dy * dy, "xy": dx * dy}.items()}
+
+
+def _rolling_corr_cumsum(cs, window):
+    """_pair_cumsums 결과 → 길이 window 창의 피어슨 상관 (…, n-window+1)
+
+    창 안의 유효 쌍이 창 크기보다 적거나 분산이 0이면 NaN (pandas rolling.corr와 동일).
+    """
+    cnt = _windowed(cs["n"], window)
+    sx, sy = _windowed(cs["x"], window), _windowed(cs["y"], window)
+    vx = _windowed(cs["xx"], window) - sx * sx / window
+    vy = _windowed(cs["yy"], window) - sy * sy / window
+    cov = _windowed(cs["xy"], window) - sx * sy / window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((cnt == window) & (vx > 0) & (vy > 0), cov / np.sqrt(vx * vy), np.nan)
+
+
+def lead_lag_surface(x, y, windows=LEAD_LAG_WINDOWS, lags=LEAD_LAG_LAGS):
+    """시차 × 창 격자의 롤링 상관 corr(x[t-lag], y[t]) → {"latest", "latest_end", "mean"} (각각 lags × windows)
+
+    시차별로 밀어 놓은 x 전체(lags × n)의 누적합을 한 번 만들고, 창마다 누적합 차분으로
+    모든 시차 · 모든 시점의 상관을 동시에 구합니다 (pandas rolling 호출 없이).
+    latest는 칸마다 값이 실제로 계산된 마지막 창의 상관이고, latest_end는 그 창이 끝나는 행 위치입니다
+    (없으면 -1). 음수 시차나 끝부분 결측으로 마지막 창이 과거일 수 있으므로 화면에는 이 날짜를 함께 표시합니다.
+    mean은 전 기간 롤링 상관의 평균입니다.
+    창 안의 유효 쌍이 창 크기보다 적으면 값을 내지 않습니다 (pandas rolling.corr와 동일).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    lags = np.asarray(lags)
+    n = len(x)
+    src = np.arange(n)[None, :] - lags[:, None]
+    xs = np.where((src >= 0) & (src < n), x[np.clip(src, 0, n - 1)], np.nan)
+    # 전체 평균을 빼서 제곱합의 상쇄 오차를 줄임
+    cs = _pair_cumsums(xs - np.nanmean(x), np.broadcast_to(y - np.nanmean(y), xs.shape))
+
+    latest = np.full((len(lags), len(windows)), np.nan)
+    latest_end = np.full(latest.shape, -1)
+    mean = np.full_like(latest, np.nan)
+    rows = np.arange(len(lags))
+    for j, w in enumerate(windows):
+        if w > n:
+            continue
+        corr = _rolling_corr_cumsum(cs, w)
+        ok = ~np.isnan(corr)
+        has = ok.any(axis=1)
+        last = corr.shape[1] - 1 - ok[:, ::-1].argmax(axis=1)  # 시차별 마지막 유효 창 (corr 열 k = 행 k+w-1에서 끝남)
+        latest[has, j] = corr[rows[has], last[has]]
+        latest_end[has, j] = last[has] + w - 1
+        mean[has, j] = np.nanmean(corr[has], axis=1)
+    return {"latest": latest, "latest_end": latest_end, "mean": mean}
+
+
+def rolling_corr_stacked(pairs, window):
+    """여러 (x, y) 시리즈 쌍의 롤링 상관을 한 번에 → 쌍마다 x 인덱스의 Series 목록
+
+    쌍마다 길이 · 거래일이 달라도 됩니다 (y는 x와 같은 인덱스). 모든 쌍을 한 배열로 이어 붙여
+    누적합 차분으로 계산하고, 쌍의 경계를 넘는 창은 버립니다 — 쌍별 pandas rolling.corr와 같은 값.
+    """
+    lens = np.array([len(x) for x, _ in pairs])
+    if lens.sum() == 0:
+        return [x.astype(float) for x, _ in pairs]
+    seg = np.repeat(np.arange(len(pairs)), lens)
+    x = np.concatenate([np.asarray(px, dtype=float) for px, _ in pairs])
+    y = np.concatenate([np.asarray(py, dtype=float) for _, py in pairs])
+    ok = ~(np.isnan(x) | np.isnan(y))
+    # 쌍별 평균을 빼서 제곱합의 상쇄 오차를 줄임
+    cnt_seg = np.maximum(np.bincount(seg, weights=ok, minlength=len(pairs)), 1)
+    mx = np.bincount(seg, np.where(ok, x, 0.0), len(pairs)) / cnt_seg
+    my = np.bincount(seg, np.where(ok, y, 0.0), len(pairs)) / cnt_seg
+
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        corr = _rolling_corr_cumsum(_pair_cumsums(x - mx[seg], y - my[seg]), window)
+        same = seg[window - 1:] == seg[:len(x) - window + 1]  # 창의 처음과 끝이 같은 쌍
+        out[window - 1:] = np.where(same, corr, np.nan)
+    parts = np.split(out, np.cumsum(lens)[:-1])
+    return [pd.Series(v, index=px.index) for (px, _), v in zip(pairs, parts)]
+
+
+# ── 캔들스틱 OHLC 피라미드 ──
+MA_LENGTHS = (20, 60, 120)
+TIMEFRAME_RULES = ("D", "W", "ME")  # 일봉 · 주봉 · 월봉
+
+
+def resample_ohlc(ohlc_df, rule):
+    """OHLC를 주봉(W) 또는 월봉(ME)으로 리샘플"""
+    return ohlc_df.resample(rule).agg({
+        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'
+    }).dropna()
+
+
+def build_ohlc_pyramid(ohlc_df):
+    """일/주/월봉을 한 번에 만들어 이동평균 · 거래량 색상까지 붙임 → {rule: DataFrame}
+
+    전체 기간 기준으로 계산하므로 기간 선택은 슬라이스만 하면 되고,
+    선택 구간 시작부터 이동평균이 이어집니다.
+    """
+    pyramid = {}
+    for rule in TIMEFRAME_RULES:
+        bars = ohlc_df.copy() if rule == "D" else resample_ohlc(ohlc_df, rule)
+        close = bars["Close"]
+        for n in MA_LENGTHS:
+            bars[f"MA{n}"] = close.rolling(n).mean()
+        bars["VolColor"] = np.where(close.to_numpy() < bars["Open"].to_numpy(), "#ef4444", "#10b981")
+        pyramid[rule] = bars
+    return pyramid
+
+
+def slice_from(frame, start):
+    """정렬된 시계열에서 start 이후 구간 (이진 탐색 슬라이스, 복사 없음)"""
+    return frame.iloc[frame.index.searchsorted(pd.Timestamp(start)):]
+
+
+# ── 차트 다운샘플링 (포인트 예산) ──
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets — 선 모양을 유지하며 n_out개 점으로 축약 (선택된 위치 인덱스 반환)
+
+    구간을 (구간 수 × 최대 구간 길이) 격자로 펼쳐 모든 구간의 삼각형 넓이를 한 번에 계산합니다.
+    꼭짓점 A(앞 구간에서 고른 점)가 순차 의존이라, 1차는 앞 구간 평균점을 A로 고르고
+    2차에서 1차에 고른 점을 A로 다시 고릅니다 (순차 LTTB와 거의 같은 점, 파이썬 루프 없음).
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # 첫/마지막 점 사이 n_out-2개 구간 (빈 구간 없음)
+    lo, hi = edges[:-1], edges[1:]
+    counts = hi - lo
+    mean_x = np.add.reduceat(x[:n - 1], lo) / counts
+    mean_y = np.add.reduceat(y[:n - 1], lo) / counts
+    # 꼭짓점 C = 다음 구간 평균 (마지막 구간은 마지막 점)
+    cx, cy = np.append(mean_x[1:], x[-1])[:, None], np.append(mean_y[1:], y[-1])[:, None]
+
+    idx = lo[:, None] + np.arange(counts.max())
+    valid = idx < hi[:, None]
+    idx = np.minimum(idx, n - 1)
+    bx, by = x[idx], y[idx]
+    rows = np.arange(len(lo))
+
+    def pick(ax_, ay_):
+        ax_, ay_ = ax_[:, None], ay_[:, None]
+        area = np.abs((ax_ - cx) * (by - ay_) - (ax_ - bx) * (cy - ay_))
+        return idx[rows, np.where(valid, area, -1.0).argmax(axis=1)]
+
+    sel = pick(np.append(x[0], mean_x[:-1]), np.append(y[0], mean_y[:-1]))
+    sel = pick(np.append(x[0], x[sel[:-1]]), np.append(y[0], y[sel[:-1]]))
+    return np.concatenate(([0], sel, [n - 1]))
+
+
+def lttb_series(s, n_out):
+    """시계열(DatetimeIndex)을 LTTB로 축약"""
+    s = s.dropna()
+    if len(s) <= n_out:
+        return s
+    x = s.index.to_numpy().astype("datetime64[s]").astype(np.int64)
+    return s.iloc[lttb(x, s.to_numpy(), n_out)]
+
+
+def bucket_ohlc(bars, n_out):
+    """연속 봉을 n_out개 묶음으로 합침 (시가=첫, 고가=최대, 저가=최소, 종가=마지막, 거래량=합)
+
+    묶음의 날짜는 첫 봉의 날짜를 씁니다. 고가/저가 극값이 보존되어 캔들 모양이 유지됩니다.
+    """
+    n = len(bars)
+    if n <= n_out:
+        return bars
+    groups = np.arange(n) * n_out // n
+    agg = bars.groupby(groups).agg({
+        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    agg.index = bars.index[np.searchsorted(groups, agg.index.to_numpy())]
+    agg["VolColor"] = np.where(agg["Close"].to_numpy() < agg["Open"].to_numpy(), "#ef4444", "#10b981")
+    return agg
@@ -0,0 +1,141 @@
+"""
+Daily Brief 시그널 백테스트 — 마지막 행에서만 판정하던 강세/약세/중립 규칙을 전 기간 시리즈로 계산하고,
+시그널별 노출 규칙의 자산 곡선 · 적중률 · 낙폭 · 상태별 선행 수익률을 구합니다.
+
+시그널 입력(상관 · 유동성 변화율)은 발표일 기준 유동성으로 만들어야 과거 시점에 알 수 없던 값이 섞이지 않습니다
+(dashboard.release_dated_inputs).
+"""
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rolling_stats import CORR_WINDOW
+
+BULL, NEUTRAL, BEAR = 1, 0, -1
+SIGNAL_LABELS = {BULL: "🟢 강세", NEUTRAL: "🟡 중립", BEAR: "🔴 약세"}
+
+# Daily Brief 기준값: corr > 0.5 and 3개월 변화 > 0 → 강세 / corr < 0 or 3개월 변화 < -1% → 약세
+DEFAULT_THRESHOLDS = {"corr_bull": 0.5, "liq_bull": 0.0, "corr_bear": 0.0, "liq_bear": -1.0}
+LIQ_LOOKBACK = 63           # Brief의 liq.iloc[-63] 대비 변화율 (행 기준)
+EXPOSURE = {BULL: 1.0, NEUTRAL: 0.5, BEAR: 0.0}
+HORIZONS = (21, 63, 126)    # 선행 수익률 기간 (거래일)
+HIT_HORIZON = 21
+TRADING_DAYS = 252
+
+
+def liq_change(liquidity):
+    """각 시점의 3개월 유동성 변화율(%) — Brief의 (liq[-1] - liq[-63]) / liq[-63]와 같은 정의"""
+    liq = liquidity.astype(float).dropna()
+    chg = (liq / liq.shift(LIQ_LOOKBACK - 1) - 1) * 100
+    return chg.reindex(liquidity.index).ffill().fillna(0.0)
+
+
+def signal_inputs(price, liquidity):
+    """(가격, 유동성) → (90일 상관, 3개월 유동성 변화율) — Corr_90d · Brief와 같은 정의"""
+    corr = liquidity.astype(float).rolling(CORR_WINDOW).corr(price.astype(float))
+    return corr, liq_change(liquidity)
+
+
+def brief_signal(corr, liq_chg, thresholds=None):
+    """(90일 상관, 3개월 유동성 변화율) → 시그널 시리즈 (BULL/NEUTRAL/BEAR), 벡터 연산
+
+    상관은 그 시점까지의 마지막 유효값, 값이 없으면 0으로 봅니다 (Brief와 동일).
+    """
+    th = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    c = corr.astype(float).ffill().fillna(0.0).to_numpy()
+    l = liq_chg.astype(float).to_numpy()
+    out = np.select(
+        [(c > th["corr_bull"]) & (l > th["liq_bull"]), (c < th["corr_bear"]) | (l < th["liq_bear"])],
+        [BULL, BEAR], NEUTRAL)
+    return pd.Series(out.astype(np.int8), index=corr.index, name="Signal")
+
+
+def max_drawdown(equity):
+    """최대 낙폭 (음수 비율)"""
+    eq = np.asarray(equity, dtype=float)
+    if eq.size == 0:
+        return 0.0
+    return float((eq / np.maximum.accumulate(eq) - 1).min())
+
+
+def forward_returns(price, horizons=HORIZONS):
+    """시점별 h거래일 선행 수익률(%) 표"""
+    p = price.astype(float)
+    return pd.DataFrame({f"{h}일": (p.shift(-h) / p - 1) * 100 for h in horizons}, index=p.index)
+
+
+def backtest(price, signal, exposure=None, horizons=HORIZONS, hit_horizon=HIT_HORIZON):
+    """시그널 → 노출 비중으로 운용한 결과
+
+    당일 시그널은 다음 거래일 수익률에 적용합니다. 시그널은 그 시점에 발표된 값으로만 만든 것이어야 합니다
+    (관측일 기준 FRED로 만든 시그널을 넣으면 발표 전 값을 쓰게 됨 — signal_inputs · release_dated 참고).
+    반환: {"equity": 전략/보유 자산 곡선, "stats": 요약 지표, "forward": 상태별 선행 수익률}
+    """
+    exposure = {**EXPOSURE, **(exposure or {})}
+    p = price.astype(float)
+    ret = p.pct_change().fillna(0.0).to_numpy()
+    sig = signal.reindex(p.index).fillna(NEUTRAL).astype(int).to_numpy()
+    weight = np.vectorize(exposure.get, otypes=[float])(sig)
+    strat = np.r_[0.0, weight[:-1]] * ret
+    equity = pd.DataFrame({"전략": np.cumprod(1 + strat), "보유": np.cumprod(1 + ret)}, index=p.index)
+
+    fwd = forward_returns(p, horizons)
+    hit_ret = fwd[f"{hit_horizon}일"].to_numpy()
+    judged = (sig != NEUTRAL) & ~np.isnan(hit_ret)
+    hits = np.sign(hit_ret[judged]) == sig[judged]
+
+    years = max(len(p) / TRADING_DAYS, 1e-9)
+    final = equity.iloc[-1] if len(equity) else pd.Series({"전략": 1.0, "보유": 1.0})
+    stats = {
+        "총수익(%)": (final["전략"] - 1) * 100,
+        "보유 총수익(%)": (final["보유"] - 1) * 100,
+        "연환산(%)": (final["전략"] ** (1 / years) - 1) * 100,
+        "최대낙폭(%)": max_drawdown(equity["전략"]) * 100,
+        "보유 최대낙폭(%)": max_drawdown(equity["보유"]) * 100,
+        f"적중률 {hit_horizon}일(%)": hits.mean() * 100 if hits.size else np.nan,
+        "평균 노출(%)": weight.mean() * 100 if weight.size else 0.0,
+    }
+    stats = {k: float(v) for k, v in stats.items()}
+
+    forward = fwd.groupby(sig).agg(["mean", "count"])
+    forward.index = [SIGNAL_LABELS[s] for s in forward.index]
+    forward.columns = [f"{h} {'평균(%)' if a == 'mean' else '표본'}" for h, a in forward.columns]
+    return {"equity": equity, "stats": stats, "forward": forward}
+
+
+# ── 임계값 스윕 (프로세스 풀) ──
+SWEEP_GRID = {
+    "corr_bull": (0.3, 0.4, 0.5, 0.6, 0.7),
+    "liq_bull": (-0.5, 0.0, 0.5, 1.0),
+    "corr_bear": (-0.2, 0.0, 0.2),
+    "liq_bear": (-2.0, -1.0, -0.5),
+}
+_SWEEP_DATA = {}
+
+
+def _sweep_init(price, corr, liq_chg):
+    """워커 프로세스당 한 번 — 시계열을 작업마다 다시 보내지 않도록 전역에 보관"""
+    _SWEEP_DATA.update(price=price, corr=corr, liq_chg=liq_chg)
+
+
+def _sweep_one(thresholds):
+    d = _SWEEP_DATA
+    stats = backtest(d["price"], brief_signal(d["corr"], d["liq_chg"], thresholds))["stats"]
+    return {**thresholds, **stats}
+
+
+def sweep(price, corr, liq_chg, grid=SWEEP_GRID, max_workers=None):
+    """임계값 조합 전체를 프로세스 풀에서 백테스트 → 연환산 수익 순 DataFrame (입력은 signal_inputs와 같음)
+
+    워커는 spawn으로 띄웁니다 — 스레드가 도는 프로세스(Streamlit 서버 · 수집 스레드 풀)에서 fork하면
+    다른 스레드가 쥔 잠금이 복사된 채 남아 워커가 멈출 수 있습니다.
+    """
+    combos = [dict(zip(grid, vals)) for vals in itertools.product(*grid.values())]
+    args = (price.astype(float), corr.astype(float), liq_chg.astype(float))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_sweep_init, initargs=args) as pool:
+        rows = list(pool.map(_sweep_one, combos, chunksize=max(1, len(combos) // 32)))
+    return pd.DataFrame(rows).sort_values("연환산(%)", ascending=False, ignore_index=True)
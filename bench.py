@@ -0,0 +1,196 @@
+"""
+파이프라인 벤치마크 — 네트워크 없이 합성 OHLC/FRED 데이터(현재 이력 길이의 1× · 10× · 100×)로
+단계별 소요 시간과 최대 메모리를 측정해 JSON으로 저장하고, 이전 결과와 비교합니다.
+
+    python bench.py                                  # 측정 → bench_results.json
+    python bench.py --scales 1 10 --repeats 3        # 일부 배율만
+    python bench.py --compare base.json              # 이전 결과 대비 변화율 (느려지면 종료 코드 1)
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+from plotly.subplots import make_subplots
+
+from analytics import (trading_calendar, asof_align, build_frame, resample_ohlc, build_ohlc_pyramid,
+                       regime_spans)
+from charts import add_recession, build_candle_figure, EVENT_MIN_GAP_DAYS
+from events import detect_auto_events, event_table
+from indicators import EAGER_COLS, COMPACT_COLS, COMPACT_DTYPE
+from rolling_stats import RollingEngine
+
+BASE_DAYS = 252 * 14        # 현재 수집 기간(14년)의 거래일 수 = 1×
+SCALES = (1, 10, 100)
+REPEATS = 3
+POINT_BUDGET = 1500         # 데스크톱 포인트 예산
+TOLERANCE = 0.2             # 비교 시 최소 소요가 20% 넘게 늘면 느려진 것으로 표시
+NOISE_MS = 2.0              # 이보다 작은 차이는 측정 잡음으로 봄
+END_DATE = "2026-10-16"     # 고정 종료일 → 실행마다 같은 데이터
+
+
+# ── 합성 데이터 ──
+def make_fixtures(scale, seed=0):
+    """(FRED 주간 Liquidity/Recession, 일간 OHLC, 기존 이벤트 목록) — 같은 seed면 항상 같은 데이터"""
+    n = BASE_DAYS * scale
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=END_DATE, periods=n, unit="s")  # 100×는 ns 범위 밖이라 초 단위
+    r = rng.normal(0.0, 0.012, n)  # 추세 없음 → 100×에서도 float32 범위 안
+    r[rng.random(n) < 0.004] *= 5  # 가끔 큰 변동 → 자동 이벤트 후보
+    close = 1000 * np.exp(np.cumsum(r))
+    ohlc = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, n)), "High": close * 1.01, "Low": close * 0.99,
+        "Close": close, "Volume": rng.integers(10**8, 10**9, n).astype(float),
+    }, index=days)
+
+    weeks = pd.date_range(end=END_DATE, periods=n // 5, freq="W-WED", unit="s")
+    fred = pd.DataFrame({
+        "Liquidity": 3000 + np.cumsum(rng.normal(1, 10, len(weeks))),
+        "Recession": ((np.arange(len(weeks)) // 52) % 8 == 0).astype(float),  # 8년마다 1년 침체
+    }, index=weeks)
+
+    events = [(f"{d.year:04d}-{d.month:02d}-{d.day:02d}", "이벤트", "설명", "📌", "up" if i % 2 else "down")
+              for i, d in enumerate(days[::60])]
+    return fred, ohlc, events
+
+
+# ── 단계 정의: 이름 → (준비 함수, 측정 함수). 준비 시간은 측정에서 제외 ──
+def make_stages(fred, ohlc, events):
+    aligned = asof_align(fred, trading_calendar(ohlc))
+    base = aligned.assign(SP500=ohlc["Close"].reindex(aligned.index))[["Liquidity", "SP500"]]
+    df, _ = build_frame(aligned, ohlc, 1, RollingEngine(), EAGER_COLS, ohlc.index[0], COMPACT_COLS, COMPACT_DTYPE)
+    bars = build_ohlc_pyramid(ohlc)["D"]
+    spans = regime_spans(df["Recession"])
+    event_tbl = event_table(events)  # 앱과 같이 이벤트 표는 미리 만들어 둠
+
+    def warm_engine():
+        """마지막 봉 하나만 빠진 상태까지 계산해 둔 엔진 → 측정은 새 봉 1개 반영"""
+        engine = RollingEngine()
+        engine.update(base.iloc[:-1], EAGER_COLS)
+        return engine
+
+    def empty_figure():
+        return make_subplots(rows=2, cols=1, shared_xaxes=True, specs=[[{"secondary_y": True}], [{}]])
+
+    def candle_figure(_=None):
+        return build_candle_figure(bars, df, POINT_BUDGET, "INDEX", "유동성", "$B", "B",
+                                   rec_spans=spans, events=event_tbl, min_gap_days=EVENT_MIN_GAP_DAYS["일봉"])
+
+    return {
+        "transform": (None, lambda _: build_frame(
+            asof_align(fred, trading_calendar(ohlc)), ohlc, 1, RollingEngine(), EAGER_COLS,
+            ohlc.index[0], COMPACT_COLS, COMPACT_DTYPE)),
+        "transform_incremental": (warm_engine, lambda engine: build_frame(
+            aligned, ohlc, 1, engine, EAGER_COLS, ohlc.index[0], COMPACT_COLS, COMPACT_DTYPE)),
+        "detect_auto_events": (None, lambda _: detect_auto_events(ohlc, events, 0.05)),
+        "resample_ohlc": (None, lambda _: (resample_ohlc(ohlc, "W"), resample_ohlc(ohlc, "ME"))),
+        "add_recession": (empty_figure, lambda fig: add_recession(fig, df, True)),
+        "figure_build": (None, candle_figure),
+        "figure_json": (candle_figure, lambda fig: fig.to_json()),
+    }
+
+
+def measure(setup, fn, repeats):
+    """중앙값 · 최소 소요(ms)와 최대 메모리(KB, tracemalloc 별도 1회) — 첫 호출은 예열로 제외
+
+    측정 중에만 경고를 끕니다 (경고 출력이 소요 시간에 섞이지 않도록).
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fn(setup() if setup else None)
+        times = []
+        for _ in range(repeats):
+            arg = setup() if setup else None
+            t0 = time.perf_counter()
+            fn(arg)
+            times.append((time.perf_counter() - t0) * 1000)
+        arg = setup() if setup else None
+        tracemalloc.start()
+        fn(arg)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"ms_median": round(statistics.median(times), 2), "ms_min": round(min(times), 2),
+            "peak_kb": round(peak / 1024, 1)}
+
+
+def run(scales=SCALES, repeats=REPEATS):
+    results = {}
+    for scale in scales:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # 100× 합성 날짜(서기 1000년 이전)의 파싱 경고
+            fred, ohlc, events = make_fixtures(scale)
+            stages = make_stages(fred, ohlc, events)
+        row = {"rows": len(ohlc)}
+        for name, (setup, fn) in stages.items():
+            row[name] = measure(setup, fn, repeats)
+            print(f"  {scale:>4}×  {name:<24}{row[name]['ms_min']:>10.1f} ms"
+                  f"{row[name]['peak_kb'] / 1024:>10.1f} MB", flush=True)
+        row["figure_payload_kb"] = round(len(stages["figure_json"][0]().to_json()) / 1024, 1)
+        results[f"{scale}x"] = row
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "python": platform.python_version(), "pandas": pd.__version__,
+            "numpy": np.__version__, "plotly": plotly.__version__,
+            "machine": platform.machine(), "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(base, new, tolerance=TOLERANCE):
+    """배율 · 단계별 최소 소요 비율 출력 → 느려진 단계 목록 (최소값이 잡음에 가장 덜 민감)"""
+    slower = []
+    for scale, row in new["results"].items():
+        old_row = base["results"].get(scale, {})
+        for name, cur in row.items():
+            if not isinstance(cur, dict) or name not in old_row:
+                continue
+            old = old_row[name]
+            ratio = cur["ms_min"] / old["ms_min"] if old["ms_min"] else float("inf")
+            mem = cur["peak_kb"] / old["peak_kb"] if old["peak_kb"] else float("inf")
+            flag = ""
+            if abs(cur["ms_min"] - old["ms_min"]) >= NOISE_MS:
+                flag = "▲ 느려짐" if ratio > 1 + tolerance else "▼ 빨라짐" if ratio < 1 - tolerance else ""
+            print(f"  {scale:>5}  {name:<24}{old['ms_min']:>10.1f} → {cur['ms_min']:>8.1f} ms"
+                  f"  ×{ratio:.2f}  메모리 ×{mem:.2f}  {flag}")
+            if flag.startswith("▲"):
+                slower.append((scale, name))
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="유동성 대시보드 파이프라인 벤치마크 (네트워크 불필요)")
+    ap.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    ap.add_argument("--repeats", type=int, default=REPEATS)
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", metavar="BASE_JSON")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = ap.parse_args(argv)
+
+    report = run(args.scales, args.repeats)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    print(f"저장: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        slower = compare(base, report, args.tolerance)
+        if slower:
+            print(f"느려진 단계 {len(slower)}개: " + ", ".join(f"{s}/{n}" for s, n in slower))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
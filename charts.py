@@ -0,0 +1,322 @@
+"""
+차트 구성 — 색상 · 공통 레이아웃 · 이벤트/음영 트레이스와 캔들스틱 Figure 생성
+(Streamlit 없이 import 가능 → 벤치마크 · 배치 작업에서도 같은 코드로 그림)
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from analytics import regime_spans, clip_spans, bucket_ohlc, lttb_series
+from events import event_table, select_events
+
+C = {
+    "liq": "#3b82f6", "liq_fill": "rgba(59,130,246,0.06)",
+    "sp": "#ef4444", "sp_fill": "rgba(239,68,68,0.04)",
+    "corr_pos": "#10b981", "corr_neg": "#ef4444",
+    "grid": "rgba(226,232,240,0.6)", "bg": "#ffffff", "paper": "#f8fafc",
+    "event": "rgba(148,163,184,0.25)", "rec": "rgba(239,68,68,0.04)",
+}
+
+BASE_LAYOUT = dict(
+    plot_bgcolor=C["bg"], paper_bgcolor=C["paper"],
+    font=dict(family="Pretendard, sans-serif", color="#475569", size=12),
+    hovermode="x unified",
+    hoverlabel=dict(bgcolor="white", bordercolor="#e2e8f0", font=dict(color="#1e293b", size=12)),
+    # ★ 수정: 상단 여백(t)을 60px로 늘려 툴바 공간 확보
+    margin=dict(t=60, b=30, l=40, r=10), dragmode="pan",
+)
+
+
+def _row_axes(fig, has_rows):
+    """(전체 Y축 레이아웃 이름, 행마다 기본 Y축 이름) — has_rows가 아니면 첫 행만"""
+    names = sorted((n for n in fig.layout if n.startswith("yaxis")), key=lambda n: int(n[5:] or 1))
+    base = [n for n in names if not fig.layout[n].overlaying]
+    return names, base if has_rows else base[:1]
+
+
+def _overlay_axes(fig, has_rows):
+    """행마다 0~1 범위의 숨김 Y축(없으면 추가) → 이벤트 세로선을 도형(shape) 대신 트레이스로 그림"""
+    names, base = _row_axes(fig, has_rows)
+    next_i = int(names[-1][5:] or 1) + 1
+    axes = []
+    for name in base:
+        short = name.replace("axis", "")
+        found = next((n for n in names if fig.layout[n].overlaying == short
+                      and fig.layout[n].visible is False), None)
+        if found is None:
+            found = f"yaxis{next_i}"
+            next_i += 1
+            fig.layout[found] = dict(overlaying=short, range=[0, 1], visible=False, fixedrange=True)
+        axes.append((fig.layout[name].anchor or "x", found.replace("axis", "")))
+    return axes
+
+
+def add_events_to_fig(fig, dff, events, has_rows=False, min_gap_days=30, mode="trace"):
+    """이벤트를 차트에 추가. min_gap_days로 최소 간격 제어하여 겹침 방지
+
+    events: 이벤트 표(events.event_table) 또는 (date, title, desc, emoji, direction) 목록
+    mode="trace": 모든 세로선을 행당 트레이스 1개, 라벨을 트레이스 1개로 묶어 그림
+                  (제목·설명은 hover) → 이벤트 수가 늘어도 레이아웃 도형 수 0
+    mode="shapes": 이벤트마다 add_vline + 기울인 제목 주석 (기존 방식)
+    """
+    if not isinstance(events, pd.DataFrame):
+        events = event_table(events)
+    picked = select_events(events, dff.index.min(), dff.index.max(), min_gap_days)
+
+    if mode == "shapes":
+        for dt, ev in zip(picked.index, picked.itertuples(index=False)):
+            kw = dict(row="all", col=1) if has_rows else {}
+            fig.add_vline(x=dt, line_width=1, line_dash="dot", line_color=C["event"], **kw)
+            clr = "#10b981" if ev.direction == "up" else "#ef4444"
+            fig.add_annotation(x=dt, y=1.04, yref="paper", text=f"{ev.emoji} {ev.title}",
+                showarrow=False, font=dict(size=11, color=clr), textangle=-38, xanchor="left")
+        return
+    if picked.empty:
+        return
+
+    dts = list(picked.index)
+    axes = _overlay_axes(fig, has_rows)
+    line_x = [v for dt in dts for v in (dt, dt, None)]
+    line_y = [0, 1, None] * len(dts)
+    for xa, ya in axes:
+        fig.add_trace(go.Scatter(
+            x=line_x, y=line_y, xaxis=xa, yaxis=ya, mode="lines",
+            line=dict(color=C["event"], width=1, dash="dot"),
+            hoverinfo="skip", showlegend=False))
+    xa, ya = axes[0]
+    fig.add_trace(go.Scatter(
+        x=dts, y=[1] * len(dts), xaxis=xa, yaxis=ya, mode="text",
+        text=picked["emoji"].tolist(), textposition="bottom center",
+        textfont=dict(size=13), cliponaxis=False, showlegend=False, name="이벤트",
+        customdata=list(zip(picked["title"], picked["desc"],
+                            np.where(picked["direction"] == "up", "#10b981", "#ef4444"))),
+        hovertemplate="<b style='color:%{customdata[2]}'>%{text} %{customdata[0]}</b>"
+                      "<br>%{customdata[1]}<extra></extra>"))
+
+
+def with_events(fig, dff, events, has_rows=False, min_gap_days=30):
+    """완성된 Figure를 복사해 이벤트 트레이스만 덧붙인 새 Figure (원본은 그대로 — 캐시 공유 객체에 사용)
+
+    원본은 이미 검증을 거친 Figure이므로 재검증 없이 복사(_validate=False) → 전체 재생성의 몇 분의 1 비용
+    """
+    out = go.Figure(fig.to_dict(), _validate=False)
+    if events is not None and len(events):
+        add_events_to_fig(out, dff, events, has_rows, min_gap_days)
+    return out
+
+
+def add_spans(fig, spans, fillcolor, has_rows=False):
+    """구간 표(start, end)를 행마다 배경 사각형(layer="below")으로 음영 — 캔들 · 거래량 아래에 깔림
+
+    구간은 수가 적어 도형으로 두고, 도형 목록을 한 번에 교체해 레이아웃 갱신은 1회로 끝냅니다.
+    채움 트레이스는 늘 캔들 · 거래량 위에 그려져 봉을 덮으므로 쓰지 않습니다 — 도형은 구간 × 행 수만큼
+    늘지만, 이벤트(수백 개)와 달리 경기침체 구간은 보관 기간 전체에서 몇 개뿐입니다.
+    """
+    if spans.empty:
+        return
+    _, base = _row_axes(fig, has_rows)
+    rects = [dict(type="rect", xref=fig.layout[n].anchor or "x", yref=f"{n.replace('axis', '')} domain",
+                  x0=s, x1=e, y0=0, y1=1, fillcolor=fillcolor, line_width=0, layer="below")
+             for n in base for s, e in zip(spans["start"], spans["end"])]
+    fig.update_layout(shapes=list(fig.layout.shapes) + rects)
+
+
+def add_recession(fig, dff, has_rows=False, spans=None):
+    """경기침체 음영. spans(데이터셋 단위 캐시)를 주면 dff 기간으로 잘라 재사용"""
+    if spans is None:
+        spans = regime_spans(dff["Recession"])
+    else:
+        spans = clip_spans(spans, dff.index.min(), dff.index.max())
+    add_spans(fig, spans, C["rec"], has_rows)
+
+
+def ax(extra=None):
+    d = dict(gridcolor=C["grid"], linecolor="#e2e8f0", tickfont=dict(size=10), showgrid=True, zeroline=False)
+    if extra: d.update(extra)
+    return d
+
+
+def compact_x(idx):
+    """날짜를 'YYYY-MM-DD' 문자열로 (기본 ISO 타임스탬프 직렬화 대비 페이로드 절감)"""
+    return idx.strftime("%Y-%m-%d")
+
+
+MA_COLORS = {"MA20": "#f59e0b", "MA60": "#3b82f6", "MA120": "#8b5cf6"}
+EVENT_MIN_GAP_DAYS = {"일봉": 14, "주봉": 45, "월봉": 120}  # 봉 주기별 이벤트 최소 간격
+
+
+def build_candle_figure(ohlc_view, dff_view, point_budget, idx_name, liq_label, liq_unit, liq_suffix,
+                        rec_spans=None, events=None, min_gap_days=30):
+    """캔들스틱 + 이동평균 + 유동성 영역 + 거래량 (+ 경기침체 음영 · 이벤트) Figure
+
+    ohlc_view: 피라미드에서 잘라낸 봉 (MA20/60/120 · VolColor 포함), dff_view: 같은 구간의 결합 프레임.
+    봉 수가 point_budget을 넘으면 캔들·거래량은 OHLC 보존 묶음, 선은 LTTB로 축약합니다.
+    """
+    # 캔들·거래량은 OHLC 보존 묶음, 선은 LTTB로 축약
+    ohlc_plot = bucket_ohlc(ohlc_view, point_budget)
+
+    # 거래량 색상
+    vol_colors = ohlc_plot["VolColor"]
+
+    fig_candle = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        row_heights=[0.75, 0.25],
+        specs=[[{"secondary_y": True}], [{"secondary_y": False}]])
+
+    # 유동성 (우측 Y축, 배경 영역) — 캔들 뒤에 깔기
+    liq_series = lttb_series(dff_view["Liq_MA"], point_budget)
+    liq_hover_fmt = f"%{{y:,.0f}}{liq_suffix}<extra>{liq_label}</extra>"
+    fig_candle.add_trace(go.Scatter(
+        x=compact_x(liq_series.index), y=liq_series.round(1), name=f"{liq_label} ({liq_unit})",
+        fill="tozeroy", fillcolor="rgba(59,130,246,0.07)",
+        line=dict(color="rgba(59,130,246,0.4)", width=1.5),
+        hovertemplate=liq_hover_fmt
+    ), row=1, col=1, secondary_y=True)
+
+    # 캔들스틱
+    fig_candle.add_trace(go.Candlestick(
+        x=compact_x(ohlc_plot.index),
+        open=ohlc_plot["Open"].round(2), high=ohlc_plot["High"].round(2),
+        low=ohlc_plot["Low"].round(2), close=ohlc_plot["Close"].round(2),
+        increasing_line_color="#10b981", increasing_fillcolor="#10b981",
+        decreasing_line_color="#ef4444", decreasing_fillcolor="#ef4444",
+        name=idx_name, whiskerwidth=0.4,
+    ), row=1, col=1)
+
+    # 이동평균선
+    for ma_name, ma_color in MA_COLORS.items():
+        s = lttb_series(ohlc_view[ma_name], point_budget)
+        if len(s) > 0:
+            fig_candle.add_trace(go.Scatter(
+                x=compact_x(s.index), y=s.round(2), name=ma_name,
+                line=dict(color=ma_color, width=1.3),
+                hovertemplate="%{y:,.0f}<extra>" + ma_name + "</extra>"
+            ), row=1, col=1)
+
+    # 거래량
+    fig_candle.add_trace(go.Bar(
+        x=compact_x(ohlc_plot.index), y=ohlc_plot["Volume"].round(0), name="거래량",
+        marker_color=vol_colors, opacity=0.5, showlegend=False,
+        hovertemplate="%{y:,.0f}<extra>Volume</extra>"
+    ), row=2, col=1)
+
+    # 리세션 음영 (이벤트 선보다 아래에 그리도록 먼저 추가)
+    add_recession(fig_candle, dff_view, True, rec_spans)
+
+    # 이벤트 표시 (봉 주기에 따라 최소 간격 조절)
+    if events is not None and len(events):
+        add_events_to_fig(fig_candle, ohlc_view, events, True, min_gap_days)
+
+    # ★ 수정: 범례를 차트 안쪽 좌측 상단으로 이동, 배경 추가
+    fig_candle.update_layout(
+        **BASE_LAYOUT, height=700, showlegend=True,
+        legend=dict(
+            yanchor="top", y=0.99,
+            xanchor="left", x=0.01,
+            font=dict(size=11),
+            bgcolor="rgba(255,255,255,0.5)", # 반투명 배경
+            bordercolor="rgba(0,0,0,0.1)",
+            borderwidth=1
+        ),
+        xaxis_rangeslider_visible=False,
+    )
+    fig_candle.update_xaxes(ax(), row=1, col=1)
+    fig_candle.update_xaxes(ax(), row=2, col=1)
+    # ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
+    fig_candle.update_yaxes(ax(dict(title=None, ticklabelposition="outside", automargin=True)), row=1, col=1, secondary_y=False)
+    # 유동성 Y축 범위 계산: 데이터 하한 기반으로 동적 설정
+    liq_min_val = liq_series.min()
+    liq_max_val = liq_series.max()
+    liq_y_min = liq_min_val * 0.85  # 하한 15% 여유
+    liq_y_max = liq_y_min + (liq_max_val - liq_y_min) / 0.6  # 변동 시각화 확대
+
+    # ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
+    fig_candle.update_yaxes(ax(dict(title=None,
+        title_font=dict(color="#3b82f6"), tickfont=dict(color="#3b82f6", size=10),
+        showgrid=False, range=[liq_y_min, liq_y_max], ticklabelposition="outside", automargin=True)), row=1, col=1, secondary_y=True)
+    # ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
+    fig_candle.update_yaxes(ax(dict(title=None, tickformat=".2s", fixedrange=True, ticklabelposition="outside", automargin=True)), row=2, col=1)
+    return fig_candle
+
+
+COMPARE_COLORS = ["#ef4444", "#10b981", "#f59e0b", "#8b5cf6", "#06b6d4", "#ec4899", "#84cc16", "#64748b"]
+
+
+def build_comparison_figure(perf, corr, liq_perf, liq_label, point_budget):
+    """여러 지수의 정규화 성과(시작 = 100) + 유동성, 아래 행에 지수별 90일 상관 — WebGL(Scattergl) 트레이스
+
+    perf · corr: 컬럼 = 지수명 (휴장일 NaN 허용, 지수별로 유효값만 그림), liq_perf: 정규화 유동성 Series.
+    트레이스마다 point_budget개 이하로 LTTB 축약합니다 (트레이스 수가 많아 원본 그대로면 페이로드가 큼).
+    """
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.65, 0.35])
+    liq = lttb_series(liq_perf, point_budget)
+    fig.add_trace(go.Scattergl(
+        x=compact_x(liq.index), y=liq.round(2), name=liq_label,
+        line=dict(color="rgba(59,130,246,0.5)", width=2, dash="dot"),
+        hovertemplate="%{y:.1f}<extra>" + liq_label + "</extra>"), row=1, col=1)
+    for i, name in enumerate(perf.columns):
+        color = COMPARE_COLORS[i % len(COMPARE_COLORS)]
+        p = lttb_series(perf[name], point_budget)
+        fig.add_trace(go.Scattergl(
+            x=compact_x(p.index), y=p.round(2), name=name, legendgroup=name,
+            line=dict(color=color, width=1.4),
+            hovertemplate="%{y:.1f}<extra>" + name + "</extra>"), row=1, col=1)
+        c = lttb_series(corr[name], point_budget)
+        fig.add_trace(go.Scattergl(
+            x=compact_x(c.index), y=c.round(3), name=name, legendgroup=name, showlegend=False,
+            line=dict(color=color, width=1.1),
+            hovertemplate="%{y:.3f}<extra>" + name + "</extra>"), row=2, col=1)
+
+    fig.update_layout(**BASE_LAYOUT, height=560, showlegend=True,
+                      legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01, font=dict(size=11),
+                                  bgcolor="rgba(255,255,255,0.5)"))
+    fig.update_xaxes(ax(), row=1, col=1)
+    fig.update_xaxes(ax(), row=2, col=1)
+    fig.update_yaxes(ax(dict(title=None, ticklabelposition="outside", automargin=True)), row=1, col=1)
+    fig.update_yaxes(ax(dict(title=None, range=[-1, 1], fixedrange=True, zeroline=True,
+                             zerolinecolor="#94a3b8", ticklabelposition="outside", automargin=True)),
+                     row=2, col=1)
+    return fig
+
+
+def build_lead_lag_figure(z, lags, windows):
+    """선행·후행 상관 히트맵 (x = 시차, y = 롤링 창, z[시차, 창])"""
+    fig = go.Figure(go.Heatmap(
+        x=list(lags), y=list(windows), z=np.round(z.T, 3),
+        colorscale="RdBu", zmin=-1, zmax=1, zmid=0,
+        colorbar=dict(thickness=10, len=0.9),
+        hovertemplate="시차 %{x}일 · 창 %{y}일<br>상관 %{z:.3f}<extra></extra>",
+    ))
+    fig.update_layout(**{**BASE_LAYOUT, "hovermode": "closest", "dragmode": False}, height=360)
+    fig.update_xaxes(ax(dict(title="시차 (거래일, + = 유동성 선행)", zeroline=True, zerolinecolor="#94a3b8")))
+    fig.update_yaxes(ax(dict(title="롤링 창 (거래일)")))
+    return fig
+
+
+def build_equity_figure(equity, idx_name, point_budget):
+    """보유 · 시그널 전략 자산 곡선 (로그 축) — 선마다 point_budget개 이하로 LTTB 축약"""
+    fig = go.Figure()
+    for col, name, line in [("보유", f"{idx_name} 보유", dict(color="#94a3b8", width=1.2)),
+                            ("전략", "시그널 전략", dict(color=C["liq"], width=1.8))]:
+        s = lttb_series(equity[col], point_budget)
+        fig.add_trace(go.Scatter(x=compact_x(s.index), y=s.round(4), name=name, line=line))
+    fig.update_layout(**BASE_LAYOUT, height=320, showlegend=True,
+                      legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+    fig.update_xaxes(ax())
+    fig.update_yaxes(ax(dict(type="log", title=None)))
+    return fig
+
+
+def build_normalized_figure(liq_norm, sp_norm, liq_label, idx_name, point_budget):
+    """유동성 · 지수 정규화(0~100) 겹침 선 — 선마다 point_budget개 이하로 LTTB 축약"""
+    fig = go.Figure()
+    for s, name, color in [(liq_norm, liq_label, C["liq"]), (sp_norm, idx_name, C["sp"])]:
+        s = lttb_series(s.dropna(), point_budget)
+        fig.add_trace(go.Scatter(x=compact_x(s.index), y=s.round(1), name=name, line=dict(color=color, width=1.5),
+                                 hovertemplate="%{y:.1f}<extra>" + name + "</extra>"))
+    fig.update_layout(**BASE_LAYOUT, height=320, showlegend=True,
+                      legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01))
+    fig.update_xaxes(ax())
+    fig.update_yaxes(ax(dict(title=None, range=[0, 100])))
+    return fig
@@ -0,0 +1,219 @@
+"""
+대시보드 계산 (Streamlit 없이) — 결합 프레임 · KPI · Daily Brief 시그널을 화면과 같은 코드로 계산하고,
+모든 국가/지수 조합을 프로세스 풀에서 한 번에 돌려 JSON · Parquet으로 저장합니다.
+
+    python dashboard.py                               # 전체 → reports/dashboard.json, dashboard.parquet
+    python dashboard.py out --country 대한민국          # 국가 이름 일부로 선택
+    LIQ_SOURCE=file python dashboard.py               # 스냅샷 소스로 (네트워크 없음)
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from analytics import trading_calendar, asof_align, release_dated, build_frame
+from backtest import (brief_signal, liq_change, signal_inputs, backtest, BULL, NEUTRAL, BEAR, SIGNAL_LABELS,
+                      LIQ_LOOKBACK)
+from data_sources import fetch_all, get_source, publication_lag
+from events import detect_auto_events, event_table, merge_events
+from indicators import EAGER_COLS, COMPACT_COLS, COMPACT_DTYPE
+from markets import COUNTRY_CONFIG, FETCH_YEARS, KEEP_YEARS, AUTO_EVENT_THRESHOLD, ALL_TICKERS, ALL_FRED_CODES
+from rolling_stats import RollingEngine
+from tracing import span
+
+SIGNAL_TEXT = {
+    BULL: "🟢 유동성 확장 + 강한 상관 → 주가 상승 지지",
+    BEAR: "🔴 유동성 수축 또는 상관 이탈 → 경계 필요",
+    NEUTRAL: "🟡 혼합 시그널 → 방향성 주시",
+}
+MOMENTUM_LOOKBACK = 21   # Brief의 지수 1개월 변화율 (행 기준)
+RECENT_EVENTS = 5        # 보고서에 넣는 최근 이벤트 수
+OUT_DIR = "reports"
+
+
+# ── 화면과 공용 계산 ──
+def fred_frame(fred_all, fred_liq, fred_rec):
+    """일괄 수집한 FRED 표 → [Liquidity, Recession] (경기침체 코드가 없으면 0)"""
+    fred_codes = [fred_liq]
+    if fred_rec:
+        fred_codes.append(fred_rec)
+    fred_df = fred_all[fred_codes].dropna(how="all").ffill()
+    if fred_rec:
+        fred_df.columns = ["Liquidity", "Recession"]
+    else:
+        fred_df.columns = ["Liquidity"]
+        fred_df["Recession"] = 0
+    return fred_df
+
+
+def dataset(fred_all, ohlc, cfg, engine=None, end_dt=None):
+    """화면의 load_data와 같은 (결합 프레임, 표시 구간 OHLC) — 캐시 없이 한 번에"""
+    end_dt = end_dt or datetime.now()
+    fred_df = asof_align(fred_frame(fred_all, cfg["fred_liq"], cfg["fred_rec"]), trading_calendar(ohlc))
+    cut = end_dt - timedelta(days=365 * KEEP_YEARS)
+    return build_frame(fred_df, ohlc, cfg["liq_divisor"], engine or RollingEngine(), EAGER_COLS, cut,
+                       COMPACT_COLS, COMPACT_DTYPE)
+
+
+def release_dated_inputs(fred_all, ohlc, fred_liq, liq_divisor, index):
+    """백테스트 · 스윕용 (90일 상관, 3개월 유동성 변화율) — 유동성을 발표일 기준으로
+
+    결합 프레임의 Liquidity는 관측일 기준(월간 BOGMBASE는 1일자 값이 수 주 뒤 발표)이라 과거 시그널에 쓰면
+    발표 전 값이 섞입니다. 코드별 발표 시차만큼 미룬 뒤 거래일에 as-of 결합하고, 전체 기간에서 계산해 index 구간만 돌려줍니다.
+    """
+    liq = release_dated(fred_all[[fred_liq]].dropna(), publication_lag(fred_liq))
+    calendar = trading_calendar(ohlc)
+    liq = asof_align(liq, calendar)[fred_liq] / liq_divisor
+    corr, liq_chg = signal_inputs(ohlc["Close"].reindex(calendar), liq)
+    return corr.reindex(index), liq_chg.reindex(index)
+
+
+def kpis(df):
+    """결합 프레임 → KPI 카드 · Daily Brief의 최신 값 (값이 없으면 0)"""
+    latest = df.dropna(subset=["Liquidity", "SP500"]).iloc[-1]
+    corr = df["Corr_90d"].dropna()
+    liq = df["Liquidity"].dropna()
+    sp = df["SP500"].dropna()
+    liq_3m_chg = ((liq.iloc[-1] - liq.iloc[-LIQ_LOOKBACK]) / liq.iloc[-LIQ_LOOKBACK] * 100
+                  if len(liq) > LIQ_LOOKBACK else 0)
+    sp_1m_chg = ((sp.iloc[-1] - sp.iloc[-MOMENTUM_LOOKBACK]) / sp.iloc[-MOMENTUM_LOOKBACK] * 100
+                 if len(sp) > MOMENTUM_LOOKBACK else 0)
+    return {
+        "liquidity": float(latest["Liquidity"]),
+        "index": float(latest["SP500"]),
+        "liq_yoy": float(latest["Liq_YoY"]) if pd.notna(latest.get("Liq_YoY")) else 0.0,
+        "index_yoy": float(latest["SP_YoY"]) if pd.notna(latest.get("SP_YoY")) else 0.0,
+        "corr_90d": float(corr.iloc[-1]) if len(corr) > 0 else 0.0,
+        "liq_3m_chg": float(liq_3m_chg),
+        "index_1m_chg": float(sp_1m_chg),
+    }
+
+
+# ── 배치 (프로세스 풀) ──
+_DATA = {}
+
+
+def _init(fred_all, indices):
+    """워커 프로세스당 한 번 — 수집 결과를 작업마다 다시 보내지 않도록 전역에 보관"""
+    _DATA.update(fred_all=fred_all, indices=indices)
+
+
+def _finite(v):
+    """JSON에 NaN 대신 null"""
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+
+def summarize(country, idx_name, fred_all, indices):
+    """국가/지수 한 조합의 KPI · 시그널 · 백테스트 요약 · 최근 이벤트 (실패 시 error 필드)"""
+    cfg = COUNTRY_CONFIG[country]
+    ticker = cfg["indices"][idx_name]
+    rec = {"country": country, "index_name": idx_name, "ticker": ticker,
+           "liq_code": cfg["fred_liq"], "liq_label": cfg["liq_label"]}
+    ohlc = indices.get(ticker)
+    if ohlc is None or ohlc.empty:
+        return {**rec, "error": "지수 데이터 없음"}
+    try:
+        df, shown = dataset(fred_all, ohlc, cfg)
+        # 현재 상태는 지금까지 발표된 전체 값으로, 백테스트는 각 시점에 발표돼 있던 값으로
+        state = int(brief_signal(df["Corr_90d"], liq_change(df["Liquidity"])).iloc[-1])
+        signal = brief_signal(*release_dated_inputs(fred_all, ohlc, cfg["fred_liq"], cfg["liq_divisor"], df.index))
+        curated = event_table(cfg["events"])
+        auto = event_table(detect_auto_events(shown, curated, AUTO_EVENT_THRESHOLD), source="auto")
+        recent = merge_events(curated, auto).iloc[-RECENT_EVENTS:]
+    except Exception as e:
+        return {**rec, "error": f"{type(e).__name__}: {e}"}
+    return {
+        **rec,
+        "as_of": df.index.max().strftime("%Y-%m-%d"),
+        "rows": len(df),
+        **kpis(df),
+        "signal": state,
+        "signal_label": SIGNAL_LABELS[state],
+        "signal_text": SIGNAL_TEXT[state],
+        "backtest": {k: _finite(v) for k, v in backtest(df["SP500"], signal)["stats"].items()},
+        "auto_events": len(auto),
+        "recent_events": [{"date": d.strftime("%Y-%m-%d"), **row}
+                          for d, row in zip(recent.index, recent.to_dict("records"))],
+    }
+
+
+def _summarize_one(pair):
+    return summarize(*pair, _DATA["fred_all"], _DATA["indices"])
+
+
+def pairs_for(countries=None):
+    """(국가, 지수명) 목록 — countries가 있으면 국가 이름에 그 문자열이 들어간 것만"""
+    return [(country, name) for country, cfg in COUNTRY_CONFIG.items()
+            if not countries or any(c in country for c in countries)
+            for name in cfg["indices"]]
+
+
+def run(pairs, max_workers=None, source=None):
+    """전 티커 · FRED 코드를 한 번에 수집 → 조합별 요약을 프로세스 풀에서 → (요약 목록, 수집 오류)"""
+    end_dt = datetime.now()
+    with span("fetch"):
+        fred_all, indices, errors = fetch_all(ALL_TICKERS, ALL_FRED_CODES,
+                                              end_dt - timedelta(days=365 * FETCH_YEARS), end_dt, source)
+    if fred_all is None:
+        return [], errors
+    # spawn — 수집 스레드 풀 · 재검증 스레드가 도는 프로세스에서 fork하면 복사된 잠금 때문에 워커가 멈출 수 있음
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init, initargs=(fred_all, indices)) as pool:
+        records = list(pool.map(_summarize_one, pairs))
+    return records, errors
+
+
+def write_report(out, records, errors, formats=("json", "parquet")):
+    """out/dashboard.json (전체) · out/dashboard.parquet (조합당 1행, 중첩 값은 펼침 · 이벤트 목록 제외)"""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = []
+    if "json" in formats:
+        report = {
+            "generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source": get_source().describe(),
+            "errors": errors,
+            "dashboards": records,
+        }
+        p = out / "dashboard.json"
+        with open(p, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        paths.append(p)
+    if "parquet" in formats and records:
+        p = out / "dashboard.parquet"
+        pd.json_normalize(records).drop(columns="recent_events", errors="ignore").to_parquet(p, index=False)
+        paths.append(p)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="모든 국가/지수의 KPI · Daily Brief 시그널을 계산해 저장 (브라우저 불필요)")
+    ap.add_argument("out", nargs="?", default=OUT_DIR)
+    ap.add_argument("--country", nargs="+", help="국가 이름 일부 (예: 미국 대한민국 순유동성)")
+    ap.add_argument("--format", nargs="+", choices=["json", "parquet"], default=["json", "parquet"])
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    pairs = pairs_for(args.country)
+    if not pairs:
+        ap.error(f"일치하는 국가 없음: {args.country}")
+    records, errors = run(pairs, args.workers)
+    for p in write_report(args.out, records, errors, args.format):
+        print(f"저장: {p}")
+    failed = [f"{r['country']} · {r['index_name']}" for r in records if "error" in r]
+    for name, msg in errors.items():
+        print(f"수집 실패 ({name}): {msg}")
+    if failed:
+        print(f"계산 실패 {len(failed)}개: " + ", ".join(failed))
+    return 1 if errors or failed or not records else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+원천 데이터 수집 — FRED · Yahoo 요청을 스레드 풀에서 동시에 실행하고,
+설정된 모든 지수를 한 번의 yf.download 호출로 받아 티커별로 나눕니다.
+
+데이터 소스는 설정(LIQ_SOURCE)으로 고릅니다.
+  live (기본) : FRED · Yahoo 네트워크 + 히스토리 저장소 증분 동기화
+                (제공자별 마감 시간 · 재시도 · 서킷 브레이커, 실패 시 저장본을 stale로 제공하고 백그라운드 재검증)
+  file        : LIQ_SNAPSHOT_DIR의 Parquet/CSV 스냅샷 (네트워크 없음 — 성능 측정 재현 · 오프라인 시연 · 장애 대응)
+"""
+import abc
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+import history_store
+from history_store import sync as sync_history
+from resilience import CircuitBreaker, ProviderError, backoff, call, RETRIES
+from tracing import span, propagate
+
+OHLC_COLS = ["Open", "High", "Low", "Close", "Volume"]
+
+SOURCE_ENV = "LIQ_SOURCE"
+SNAPSHOT_ENV = "LIQ_SNAPSHOT_DIR"
+SNAPSHOT_DIR = Path(__file__).with_name("snapshots")
+
+REVALIDATE_TIMEOUT_SECS = 120   # 백그라운드 재검증 · 저장본이 없을 때(기다릴 수밖에 없음)의 마감
+STALE_TIMEOUT_SECS = 5.0        # 저장본이 있을 때 화면 쪽 수집 마감 (시도 1회) — 넘기면 바로 저장본 + 백그라운드 재검증
+REVALIDATE_BACKOFF_BASE = 5.0   # 재검증 대기 상한 = min(브레이커 cooldown, 5 · 2^시도)
+
+# 합성 FRED 시리즈 — 이름: {FRED 코드: 가중치}. 가중치로 단위도 맞춤 (결과 단위: Billions of USD)
+COMPOSITE_SERIES = {
+    # 순유동성 = Fed 총자산 − 재무부 일반계정(TGA) − 역레포
+    "NETLIQ": {"WALCL": 1e-3, "WTREGEN": -1, "RRPONTSYD": -1},  # WALCL만 Millions 단위
+}
+
+# FRED 관측일 → 발표일 시차 (일, 보수적 근사). FRED 값은 관측일로 찍혀 있어 과거 시점 재현에는 이만큼 미뤄 씀
+PUBLICATION_LAG_DAYS = {
+    "BOGMBASE": 56,    # 월간 H.6 — 1일자 값이 다음 달 하순에 발표
+    "WALCL": 1,        # 주간 H.4.1 — 수요일 값이 다음 날 발표
+    "WTREGEN": 1,
+    "RRPONTSYD": 1,    # 일간 — 당일 오후 발표
+}
+# 표에 없는 코드(새로 추가한 국가 · 시리즈)의 시차 — 가장 늦은 월간 발표보다 길게 잡아
+# 백테스트가 미래 값을 보지 않도록 하고, 정확한 값은 위 표에 추가
+DEFAULT_PUBLICATION_LAG_DAYS = 60
+
+
+def fred_components(codes):
+    """요청 코드 → 실제로 받을 FRED 코드 (합성 시리즈는 구성 코드로 펼침, 중복 제거)"""
+    return list(dict.fromkeys(
+        c for code in codes for c in COMPOSITE_SERIES.get(code, {code: 1})))
+
+
+def publication_lag(code):
+    """코드의 발표 시차 (합성 시리즈는 가장 늦게 발표되는 구성 코드 기준). 표에 없는 코드는 기본 시차"""
+    return pd.Timedelta(days=max(PUBLICATION_LAG_DAYS.get(c, DEFAULT_PUBLICATION_LAG_DAYS)
+                                 for c in fred_components([code])))
+
+
+def composite(raw, weights):
+    """구성 시리즈(발표 주기가 달라도 됨)를 합집합 날짜에서 ffill 후 가중합 — 모두 값이 있는 날부터"""
+    parts = raw[list(weights)].ffill()
+    return parts.mul(pd.Series(weights)).sum(axis=1, min_count=len(weights))
+
+
+def split_ohlc(yf_data, tickers):
+    """yf.download 결과(단일/멀티 티커)를 {ticker: OHLCV} 로 분리"""
+    out = {}
+    if yf_data is None or yf_data.empty:
+        return out
+    if isinstance(yf_data.columns, pd.MultiIndex):
+        for t in tickers:
+            if t not in yf_data.columns.get_level_values(1):
+                continue
+            ohlc = yf_data.xs(t, axis=1, level=1)[OHLC_COLS]
+            # 시장별 휴장일은 다른 티커 때문에 NaN 행으로 남음 → 제거
+            out[t] = ohlc.dropna(subset=["Close"])
+    else:
+        out[tickers[0]] = yf_data[OHLC_COLS].dropna(subset=["Close"])
+    return out
+
+
+# ── 데이터 소스 ──
+class DataSource(abc.ABC):
+    """원천 데이터 인터페이스 (fred · indices는 구현 필수)
+
+    fred(codes, start, end)      → DataFrame (컬럼 = FRED 코드, 합성 시리즈 아님)
+    indices(tickers, start, end) → {ticker: OHLCV DataFrame} (없는 티커는 빠짐)
+    revision                     → 백그라운드 재검증으로 데이터가 바뀔 때마다 증가 (캐시 키에 포함)
+    """
+    name = "base"
+    revision = 0
+
+    @abc.abstractmethod
+    def fred(self, codes, start, end):
+        ...
+
+    @abc.abstractmethod
+    def indices(self, tickers, start, end):
+        ...
+
+    def describe(self):
+        return self.name
+
+    def stale(self):
+        """마지막 정상 데이터(저장본)로 대체 중인 제공자 → {제공자: {"since", "error"}}"""
+        return {}
+
+    def health(self):
+        """제공자별 서킷 브레이커 상태 목록"""
+        return []
+
+
+class LiveSource(DataSource):
+    """FRED(DataReader) · Yahoo(yf.download) — 여러 코드/티커를 각각 한 번의 호출로, 저장본은 증분만
+
+    제공자 호출은 resilience.call로 보호합니다. 실패하거나 마감을 넘기면 히스토리 저장본(마지막 정상 데이터)을
+    바로 돌려주고 stale로 표시한 뒤, 백그라운드 스레드가 다시 받아 저장하고 revision을 올립니다.
+    """
+    name = "live"
+
+    def __init__(self):
+        self.breakers = {p: CircuitBreaker(p) for p in ("fred", "yahoo")}
+        self._stale = {}
+        self._revalidating = set()
+        self._synced = {}  # 제공자별 화면 쪽 수집 성공 횟수 — 재검증 스레드가 멈출 때를 판단
+        self._lock = threading.Lock()
+
+    def _sync(self, provider, keys, fetch, start, end, required=False):
+        """저장본 증분 동기화 — 실패 시 저장본으로 대체 (저장본이 없으면 오류)
+
+        required면 응답 · 저장본 어디에도 없는 키가 있을 때 키를 나열한 LookupError (history_store.sync).
+        """
+        # 저장본이 있으면 한 번만 짧게 시도하고 재시도는 백그라운드 재검증에 맡김.
+        # 대체할 저장본이 없으면 기다리는 수밖에 없으므로 마감을 길게, 재시도도 화면 쪽에서
+        if all(history_store.has(k) for k in keys):
+            timeout, retries = STALE_TIMEOUT_SECS, 0
+        else:
+            timeout, retries = REVALIDATE_TIMEOUT_SECS, RETRIES
+        guarded = lambda since, until: call(lambda: fetch(since, until), self.breakers[provider], timeout, retries)
+        try:
+            out = sync_history(keys, guarded, start, end, required=required)
+        except ProviderError as e:
+            self._revalidate(provider, keys, fetch, start, end)
+            with span("stale", provider=provider, error=str(e)):
+                stored = sync_history(keys, lambda since, until: {}, start, end)
+            if len(stored) < len(keys):
+                raise
+            since = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%m/%d %H:%M:%S")
+            with self._lock:
+                self._stale.setdefault(provider, {"since": since, "error": str(e)})
+            return stored
+        with self._lock:
+            self._stale.pop(provider, None)
+            self._synced[provider] = self._synced.get(provider, 0) + 1
+        return out
+
+    def _revalidate(self, provider, keys, fetch, start, end):
+        """백그라운드 재수집 (제공자당 스레드 하나) — 성공하면 저장 후 stale 해제 · revision 증가
+
+        브레이커 cooldown을 넘지 않는 간격으로 성공할 때까지 계속 시도합니다. 그 사이 다음 경계의
+        화면 쪽 수집이 성공하면 더 받을 필요가 없으므로 멈춥니다.
+        """
+        with self._lock:
+            if provider in self._revalidating:
+                return
+            self._revalidating.add(provider)
+            synced = self._synced.get(provider, 0)
+        breaker = self.breakers[provider]
+
+        def work():
+            try:
+                attempt = 0
+                while True:
+                    time.sleep(max(breaker.retry_in(),
+                                   backoff(attempt, base=REVALIDATE_BACKOFF_BASE, cap=breaker.cooldown)))
+                    attempt = min(attempt + 1, 16)  # 대기 상한은 cooldown에서 멈추므로 지수만 묶어 둠
+                    with self._lock:
+                        if self._synced.get(provider, 0) != synced:
+                            return
+                    try:
+                        sync_history(keys, lambda since, until: call(
+                            lambda: fetch(since, until), breaker, REVALIDATE_TIMEOUT_SECS, 0), start, end)
+                    except ProviderError:
+                        continue
+                    with self._lock:
+                        self._stale.pop(provider, None)
+                        self.revision += 1
+                    return
+            finally:
+                with self._lock:
+                    self._revalidating.discard(provider)
+
+        threading.Thread(target=work, name=f"revalidate-{provider}", daemon=True).start()
+
+    def stale(self):
+        with self._lock:
+            return {p: dict(v) for p, v in self._stale.items()}
+
+    def health(self):
+        return [b.status() for b in self.breakers.values()]
+
+    def fred(self, codes, start, end):
+        import pandas_datareader.data as web
+        codes = list(codes)
+
+        def fetch(since, until):
+            with span("fred.DataReader", since=str(since)[:10], codes=len(codes)):
+                raw = web.DataReader(codes, "fred", since, until)
+            return {f"fred/{c}": raw[[c]] for c in codes if c in raw.columns}
+
+        # 코드 하나라도 빠지면 유동성 합성이 불가능하므로 필수 (Yahoo는 받은 티커만 씀)
+        stored = self._sync("fred", [f"fred/{c}" for c in codes], fetch, start, end, required=True)
+        return pd.concat([stored[f"fred/{c}"] for c in codes], axis=1).sort_index()
+
+    def indices(self, tickers, start, end):
+        import yfinance as yf
+        tickers = list(tickers)
+
+        def fetch(since, until):
+            with span("yahoo.download", since=str(since)[:10], tickers=len(tickers)):
+                yf_data = yf.download(tickers, start=since, end=until, progress=False)
+            return {f"yahoo/{t}": o for t, o in split_ohlc(yf_data, tickers).items()}
+
+        stored = self._sync("yahoo", [f"yahoo/{t}" for t in tickers], fetch, start, end)
+        return {t: stored[f"yahoo/{t}"] for t in tickers if f"yahoo/{t}" in stored}
+
+    def describe(self):
+        return "live · FRED + Yahoo Finance"
+
+
+class FileSource(DataSource):
+    """스냅샷 디렉터리: <root>/fred/<CODE>.parquet|csv · <root>/yahoo/<TICKER>.parquet|csv
+
+    히스토리 저장소(.history/)와 같은 구조라 저장소 디렉터리를 그대로 스냅샷으로 쓸 수 있습니다.
+    """
+    name = "file"
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _read(self, key):
+        """key(예: fred/USREC)의 프레임 — Parquet 우선, 없으면 CSV. 둘 다 없으면 None"""
+        p = self.root / f"{key}.parquet"
+        if p.exists():
+            return pd.read_parquet(p)
+        p = self.root / f"{key}.csv"
+        if p.exists():
+            return pd.read_csv(p, index_col=0, parse_dates=True)
+        return None
+
+    @staticmethod
+    def _window(df, start, end):
+        return df[(df.index >= pd.Timestamp(start)) & (df.index <= pd.Timestamp(end))]
+
+    def fred(self, codes, start, end):
+        frames = []
+        for c in codes:
+            df = self._read(f"fred/{c}")
+            if df is None:
+                raise FileNotFoundError(f"스냅샷에 FRED 코드 없음: {self.root / 'fred' / c}")
+            frames.append(self._window(df[[c]], start, end))
+        return pd.concat(frames, axis=1).sort_index()
+
+    def indices(self, tickers, start, end):
+        out = {}
+        for t in tickers:
+            df = self._read(f"yahoo/{t}")
+            if df is not None:
+                out[t] = self._window(df[OHLC_COLS], start, end).dropna(subset=["Close"])
+        return out
+
+    def describe(self):
+        return f"file · {self.root}"
+
+
+_SOURCE = None
+
+
+def get_source():
+    """설정(LIQ_SOURCE · LIQ_SNAPSHOT_DIR)에 맞는 데이터 소스 (프로세스당 하나)"""
+    global _SOURCE
+    if _SOURCE is None:
+        kind = os.environ.get(SOURCE_ENV, "live")
+        if kind == "file":
+            _SOURCE = FileSource(os.environ.get(SNAPSHOT_ENV, SNAPSHOT_DIR))
+        elif kind == "live":
+            _SOURCE = LiveSource()
+        else:
+            raise ValueError(f"{SOURCE_ENV}={kind!r} — live 또는 file")
+    return _SOURCE
+
+
+def write_snapshot(root, fred_df, indices, fmt="parquet"):
+    """수집 결과를 FileSource가 읽는 구조로 저장"""
+    root = Path(root)
+    items = [(f"fred/{c}", fred_df[[c]]) for c in fred_df.columns]
+    items += [(f"yahoo/{t}", ohlc) for t, ohlc in indices.items()]
+    for key, df in items:
+        p = root / f"{key}.{fmt}"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "parquet":
+            df.to_parquet(p)
+        else:
+            df.to_csv(p)
+
+
+# ── 수집 (소스 공통: 합성 시리즈 · 동시 요청) ──
+def fetch_fred(codes, start, end, source=None):
+    """FRED 여러 코드를 한 번의 요청으로
+
+    합성 시리즈는 구성 코드를 같은 요청에 함께 받아 가중합 컬럼으로 만듭니다.
+    """
+    source = source or get_source()
+    codes = list(codes)
+    with span("fetch.fred", source=source.name):
+        raw = source.fred(fred_components(codes), start, end)
+        for code in codes:
+            if code in COMPOSITE_SERIES:
+                raw[code] = composite(raw, COMPOSITE_SERIES[code])
+        return raw[codes]
+
+
+def fetch_indices(tickers, start, end, source=None):
+    """여러 지수를 한 번의 요청으로 받아 티커별 OHLC로 분리"""
+    source = source or get_source()
+    with span("fetch.yahoo", source=source.name):
+        return source.indices(list(tickers), start, end)
+
+
+def fetch_all(tickers, fred_codes, start, end, source=None):
+    """FRED · Yahoo 동시 요청 → (fred_df, {ticker: ohlc}, {소스: 오류 메시지})
+
+    한 소스가 실패해도 다른 소스 결과는 그대로 돌려줍니다.
+    """
+    source = source or get_source()
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {
+            "fred": pool.submit(propagate(fetch_fred), fred_codes, start, end, source),
+            "yahoo": pool.submit(propagate(fetch_indices), tickers, start, end, source),
+        }
+        for name, fut in futures.items():
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                results[name] = None
+                errors[name] = str(e)
+    return results["fred"], results["yahoo"] or {}, errors
+
+
+if __name__ == "__main__":
+    # 스냅샷 만들기: python data_sources.py snapshots --tickers ^GSPC ^IXIC --fred BOGMBASE USREC
+    ap = argparse.ArgumentParser(description="현재 소스(LIQ_SOURCE)의 데이터를 FileSource 스냅샷으로 저장")
+    ap.add_argument("out", nargs="?", default=str(SNAPSHOT_DIR))
+    ap.add_argument("--tickers", nargs="+", required=True)
+    ap.add_argument("--fred", nargs="+", required=True, help="FRED 코드 (합성 시리즈는 구성 코드로 저장)")
+    ap.add_argument("--years", type=int, default=14)
+    ap.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    args = ap.parse_args()
+
+    end = datetime.now()
+    start = end - timedelta(days=365 * args.years)
+    src = get_source()
+    write_snapshot(args.out, src.fred(fred_components(args.fred), start, end),
+                   src.indices(args.tickers, start, end), args.format)
+    print(f"저장: {args.out} ({src.describe()})")
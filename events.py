@@ -0,0 +1,83 @@
+"""
+시장 이벤트 — OHLC 일간 변동률 기반 자동 이벤트 감지 (전체 시계열 벡터 연산)와
+이벤트 표(날짜 인덱스 열 형식): 문자열 날짜는 표를 만들 때 한 번만 파싱하고,
+구간 · 최소 간격 조회는 searchsorted로 처리합니다.
+"""
+import numpy as np
+import pandas as pd
+
+EVENT_COLUMNS = ["title", "desc", "emoji", "direction", "source"]  # source: curated(큐레이션) · auto(자동 감지)
+
+
+def detect_auto_events_multi(ohlc_df, base_events, thresholds):
+    """여러 임계값을 한 번에 → {threshold: [(date, title, desc, emoji, direction), ...]}
+
+    변동률 계산·기존 이벤트 날짜 제외는 한 번만 수행하고,
+    가장 낮은 임계값의 후보만 문자열로 만든 뒤 임계값별로 잘라 씁니다.
+    """
+    thresholds = list(thresholds)
+    if ohlc_df is None or ohlc_df.empty or len(ohlc_df) < 2 or not thresholds:
+        return {th: [] for th in thresholds}
+
+    daily_ret = ohlc_df["Close"].pct_change()
+    abs_ret = daily_ret.abs().to_numpy()
+    if isinstance(base_events, pd.DataFrame):
+        existing = base_events.index.normalize()
+    else:
+        existing = pd.to_datetime([d for d, *_ in base_events]).normalize()
+    mask = (abs_ret >= min(thresholds)) & ~daily_ret.index.normalize().isin(existing)
+    mask &= ~np.isnan(abs_ret)
+
+    hits = daily_ret[mask]
+    hit_abs = abs_ret[mask]
+    dates = hits.index.strftime("%Y-%m-%d")
+    pct = [f"{p:+.1f}%" for p in hits.to_numpy() * 100]
+    up = hits.to_numpy() > 0
+    rows = [
+        (d, f"급등 {p}", f"하루 {p} 변동", "🔥", "up") if u
+        else (d, f"급락 {p}", f"하루 {p} 변동", "⚡", "down")
+        for d, p, u in zip(dates, pct, up)
+    ]
+    return {th: [r for r, a in zip(rows, hit_abs) if a >= th] for th in thresholds}
+
+
+def detect_auto_events(ohlc_df, base_events, threshold=0.05):
+    """일간 변동률 |ret| ≥ threshold 인 날(기존 이벤트 날짜 제외)을 자동 이벤트로"""
+    return detect_auto_events_multi(ohlc_df, base_events, [threshold])[threshold]
+
+
+# ── 이벤트 표 ──
+def event_table(events, source="curated"):
+    """[(date, title, desc, emoji, direction), ...] → 날짜순 DataFrame (DatetimeIndex, 같은 날짜는 입력 순서 유지)"""
+    rows = list(events)
+    index = pd.DatetimeIndex(pd.to_datetime([r[0] for r in rows]), name="date")
+    table = pd.DataFrame([r[1:] for r in rows], index=index, columns=EVENT_COLUMNS[:-1])
+    table["source"] = source
+    return table.sort_index(kind="stable")
+
+
+def merge_events(*tables):
+    """여러 이벤트 표를 날짜순으로 합침 (같은 날짜는 인자 순서대로)"""
+    return pd.concat(tables).sort_index(kind="stable")
+
+
+def select_events(table, start=None, end=None, min_gap_days=0):
+    """[start, end] 구간의 이벤트 — min_gap_days가 있으면 직전에 고른 이벤트와 그보다 가까운 이벤트는 건너뜀
+
+    구간은 정렬된 인덱스의 searchsorted로 자르고, 간격이 모두 충분하면(diff) 그대로 돌려줍니다.
+    아니면 고른 이벤트마다 searchsorted로 다음 후보(+min_gap_days 이후 첫 이벤트)로 건너뜁니다.
+    """
+    idx = table.index
+    lo = 0 if start is None else idx.searchsorted(pd.Timestamp(start), "left")
+    hi = len(idx) if end is None else idx.searchsorted(pd.Timestamp(end), "right")
+    picked = table.iloc[lo:hi]
+    if min_gap_days <= 0 or len(picked) < 2:
+        return picked
+    days = picked.index.to_numpy().astype("datetime64[D]").astype(np.int64)
+    if (np.diff(days) >= min_gap_days).all():
+        return picked
+    keep, i = [], 0
+    while i < len(days):
+        keep.append(i)
+        i = days.searchsorted(days[i] + min_gap_days, "left")
+    return picked.iloc[keep]
@@ -0,0 +1,123 @@
+"""
+히스토리 저장소 — 시계열/티커별 Parquet 파일에 누적 저장하고,
+갱신 시에는 마지막 저장일 이후의 증분(delta)만 내려받아 병합합니다.
+"""
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+STORE_DIR = Path(os.environ.get("LIQ_STORE_DIR", Path(__file__).with_name(".history")))
+
+# 마지막 저장일 이전 N일은 다시 받아 덮어쓰기 — 제공자(키 접두어)별.
+# FRED는 H.4.1 · H.6 수정치가 몇 주 ~ 두 달 뒤에도 들어오므로 길게, Yahoo는 미확정 봉만 덮으면 충분
+OVERLAP_DAYS = {"fred": 90, "yahoo": 10}
+DEFAULT_OVERLAP_DAYS = 10
+# 저장본 시작일이 요청 시작일보다 이만큼 늦으면 전체를 다시 받음 (월간 시리즈 여유 포함)
+COVERAGE_SLACK_DAYS = 40
+
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _path(key):
+    return STORE_DIR / f"{key}.parquet"
+
+
+def has(key):
+    """저장본 파일이 있는지 (읽지 않고 확인)"""
+    return _path(key).exists()
+
+
+def read(key):
+    """저장된 프레임 읽기 (없거나 손상되면 None)"""
+    p = _path(key)
+    if not p.exists():
+        return None
+    try:
+        return pd.read_parquet(p)
+    except Exception:
+        return None
+
+
+def _key_lock(key):
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(key, threading.Lock())
+
+
+def write(key, df):
+    """쓰기마다 고유한 임시 파일에 쓴 뒤 교체 — 읽는 쪽은 항상 완전한 파일만 봅니다. 쓰기 실패는 무시
+
+    같은 프로세스 안에서 같은 키의 쓰기는 키별 잠금으로 하나씩 진행하고,
+    다른 프로세스와 겹치면 마지막으로 교체한 쪽이 남습니다 (어느 쪽이든 완전한 파일).
+    """
+    p = _path(key)
+    tmp = None
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with _key_lock(key):
+            with tempfile.NamedTemporaryFile(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp", delete=False) as f:
+                tmp = f.name
+                df.to_parquet(f)
+            os.replace(tmp, p)
+    except Exception:
+        # 읽기 전용 파일시스템 등 — 저장 없이 계속 진행
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _merge(stored, fresh):
+    """저장본 + 신규분 병합 (겹치는 날짜는 신규분 우선)"""
+    if stored is None or stored.empty:
+        return fresh
+    if fresh is None or fresh.empty:
+        return stored
+    merged = pd.concat([stored, fresh])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+
+def overlap_for(keys):
+    """keys(예: fred/WALCL)를 한 번에 받을 때의 겹침 일수 — 접두어별 값 중 가장 긴 것"""
+    return max((OVERLAP_DAYS.get(k.split("/", 1)[0], DEFAULT_OVERLAP_DAYS) for k in keys),
+               default=DEFAULT_OVERLAP_DAYS)
+
+
+def _delta_start(stored_frames, start, overlap_days):
+    """모든 키를 한 번에 받을 수 있는 가장 이른 증분 시작일"""
+    since = None
+    for df in stored_frames:
+        if df is None or df.empty or df.index.min() > start + timedelta(days=COVERAGE_SLACK_DAYS):
+            return start  # 저장본 없음/범위 부족 → 전체 다운로드
+        s = df.index.max() - timedelta(days=overlap_days)
+        since = s if since is None else min(since, s)
+    return max(since, start) if since is not None else start
+
+
+def sync(keys, fetch, start, end, overlap_days=None, required=False):
+    """keys의 저장본을 증분 갱신하고 [start, end] 구간 프레임을 {key: DataFrame}로 반환
+
+    fetch(since, end)는 {key: DataFrame(DatetimeIndex)}를 돌려주는 함수로,
+    여러 키를 한 번의 요청으로 받아오도록 구현합니다. overlap_days를 생략하면 키의 제공자별 값(overlap_for).
+    저장본에도 응답에도 없는 키는 결과에서 빠지며, required면 그런 키를 나열해 LookupError를 냅니다.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    stored = {k: read(k) for k in keys}
+    since = _delta_start(stored.values(), start, overlap_for(keys) if overlap_days is None else overlap_days)
+    fresh = fetch(since, end)
+
+    out, missing = {}, []
+    for k in keys:
+        new = fresh.get(k)
+        merged = _merge(stored[k], new)
+        if merged is None:
+            missing.append(k)
+            continue
+        if new is not None and not new.empty:
+            write(k, merged)
+        out[k] = merged[(merged.index >= start) & (merged.index <= end)]
+    if required and missing:
+        raise LookupError(f"저장본 · 응답 모두에 데이터 없음: {', '.join(missing)}")
+    return out
@@ -0,0 +1,47 @@
+"""
+파생 지표 구성 — 화면이 항상 읽는 파생 컬럼과, 차트에 그리기만 해서 float32로 보관해도 되는 컬럼,
+그리고 처음 읽을 때만 계산하는 지표 레지스트리.
+
+원천(Liquidity · SP500)과 KPI · 보고서에 값이 그대로 나가는 컬럼은 float64로 둡니다
+(float32로 줄이면 1526.858154296875 같은 잡음이 카드와 JSON에 드러남).
+"""
+import threading
+from collections import OrderedDict
+
+from rolling_stats import derive_full
+
+# 결합 프레임에 계산해 두는 파생 컬럼 (Liq_MA: 차트, 나머지: KPI · Brief)
+EAGER_COLS = ["Liq_MA", "Liq_YoY", "SP_YoY", "Corr_90d"]
+# 차트 전용 파생 컬럼 — 표시용 정밀도면 충분하므로 float32 (메모리 절반)
+COMPACT_COLS = ["Liq_MA"]
+COMPACT_DTYPE = "float32"
+
+# 지연 계산 지표 → 보관 dtype. 결합 프레임에는 넣지 않고, 읽는 화면이 있을 때만 (지표, 데이터셋, 버전)별로 계산
+LAZY_COLS = {"SP_MA": COMPACT_DTYPE, "Liquidity_norm": COMPACT_DTYPE, "SP500_norm": COMPACT_DTYPE}
+
+
+def lazy_indicator(name, frame):
+    """레지스트리 지표 하나를 결합 프레임(Liquidity · SP500)에서 계산해 등록된 dtype으로 반환"""
+    return derive_full(frame, [name])[name].astype(LAZY_COLS[name])
+
+
+class FootprintLog:
+    """캐시 항목별 메모리 사용량 기록 (최근 max_entries개) — 로더가 계산할 때 남기고 상태 패널이 읽음"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, key, series):
+        row = {"dtype": str(series.dtype), "행": len(series),
+               "KB": round(series.memory_usage(index=False) / 1024, 1)}
+        with self._lock:
+            self._items[key] = row
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def rows(self):
+        with self._lock:
+            return [{"항목": " · ".join(map(str, key)), **row} for key, row in self._items.items()]
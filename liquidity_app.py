@@ -1,11 +1,24 @@
 import streamlit as st
 import pandas as pd
-import pandas_datareader.data as web
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import numpy as np
 from zoneinfo import ZoneInfo
+from data_sources import fetch_all, get_source
+from prewarm import Prewarmer
+from markets import COUNTRY_CONFIG, FETCH_YEARS, KEEP_YEARS, AUTO_EVENT_THRESHOLD, ALL_TICKERS, ALL_FRED_CODES
+from dashboard import fred_frame, kpis, release_dated_inputs, SIGNAL_TEXT
+from rolling_stats import RollingEngine
+from indicators import EAGER_COLS, COMPACT_COLS, COMPACT_DTYPE, FootprintLog, lazy_indicator
+from events import detect_auto_events, event_table, merge_events, select_events
+from backtest import (brief_signal, liq_change, backtest, sweep, BULL, BEAR,
+                      DEFAULT_THRESHOLDS, EXPOSURE, HIT_HORIZON)
+from analytics import (trading_calendar, build_frame, calendar_key, asof_align, regime_spans, build_ohlc_pyramid, slice_from,
+                       lead_lag_surface, LEAD_LAG_WINDOWS, LEAD_LAG_LAGS, rolling_corr_stacked)
+from rolling_stats import CORR_WINDOW
+from charts import (build_candle_figure, build_comparison_figure, build_lead_lag_figure, build_equity_figure,
+                    build_normalized_figure, with_events, EVENT_MIN_GAP_DAYS)
+import tracing
+from tracing import span, mark_miss, note
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 페이지 설정 (즐겨찾기 아이콘 적용)
@@ -22,16 +35,24 @@ try:
 except Exception:
     pass  # 파일이 없거나 구버전 Streamlit일 경우 무시
 
+# 디버그 패널: ?debug=1 일 때만 이번 실행의 단계별 소요를 수집 (아니면 계측은 no-op)
+DEBUG = st.query_params.get("debug") == "1"
+if DEBUG:
+    tracing.start_run()
+else:
+    tracing.stop_run()  # 이전 실행이 중간에 멈춰 남은 수집 상태 정리
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 자동 새로고침 (PST 09:00/18:00 + KST 09:00/18:00 = 하루 4회)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+REFRESH_UTC_HOURS = [0, 2, 9, 17]
+
 def get_next_refresh():
     """다음 새로고침 시각까지 남은 초 계산 (PST 09/18 + KST 09/18)"""
     utc_now = datetime.now(ZoneInfo("UTC"))
-    utc_hours = [0, 2, 9, 17]
 
     targets = []
-    for h in utc_hours:
+    for h in REFRESH_UTC_HOURS:
         t = utc_now.replace(hour=h, minute=0, second=0, microsecond=0)
         if t <= utc_now:
             t += timedelta(days=1)
@@ -42,13 +63,36 @@ def get_next_refresh():
     local_next = next_t.astimezone(ZoneInfo("Asia/Seoul"))
     return local_next, secs
 
+def get_data_version():
+    """가장 최근에 지난 데이터 경계 시각 (UTC) — 캐시 키로 사용해 경계마다 새 데이터로 전환
+
+    백그라운드 재검증이 새 데이터를 받으면 소스 revision이 붙어 바뀌므로, stale로 캐시된 결과도 곧바로 교체됩니다.
+    """
+    utc_now = datetime.now(ZoneInfo("UTC"))
+    passed = []
+    for h in REFRESH_UTC_HOURS:
+        t = utc_now.replace(hour=h, minute=0, second=0, microsecond=0)
+        if t > utc_now:
+            t -= timedelta(days=1)
+        passed.append(t)
+    version = max(passed).strftime("%Y-%m-%dT%H:%MZ")
+    rev = get_source().revision
+    return f"{version}+r{rev}" if rev else version
+
 NEXT_REFRESH_TIME, REFRESH_SECS = get_next_refresh()
+DATA_VERSION = get_data_version()
 
-auto_interval = min(REFRESH_SECS * 1000, 3600_000)
-st.markdown(
-    f'<meta http-equiv="refresh" content="{min(REFRESH_SECS, 3600)}">',
-    unsafe_allow_html=True,
-)
+# 페이지 새로고침(meta refresh) 대신: 작은 프래그먼트가 주기적으로 데이터 버전만 확인하고,
+# 경계가 지나 버전이 바뀐 경우에만 세션 안에서 재실행 (세션·위젯 상태 유지, 캐시는 사전 갱신됨)
+VERSION_POLL_SECS = 60
+
+@st.fragment(run_every=VERSION_POLL_SECS)
+def watch_data_version():
+    """버전이 그대로면 아무것도 하지 않음"""
+    if get_data_version() != DATA_VERSION:
+        st.rerun()
+
+watch_data_version()
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # CSS (툴바 위치 상단 이동 및 여백 조정)
@@ -300,262 +344,275 @@ footer { display: none !important; }
 """, unsafe_allow_html=True)
 
 
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 데이터 & 이벤트
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-MARKET_PIVOTS = [
-    # 2015
-    ("2015-08-24", "중국발 블랙먼데이",       "위안 절하·중국 증시 폭락 → 글로벌 동반 급락 -3.9%",   "🇨🇳", "down"),
-    # 2016
-    ("2016-02-11", "유가 폭락 바닥",         "WTI $26 → 에너지·은행주 바닥 형성, S&P 1,829",       "🛢️", "down"),
-    ("2016-06-23", "브렉시트 투표",          "영국 EU 탈퇴 결정 → 이틀간 -5.3% 후 빠른 회복",       "🇬🇧", "down"),
-    ("2016-11-08", "트럼프 1기 당선",        "감세 기대 → 리플레이션 랠리",                         "🗳️", "up"),
-    # 2017
-    ("2017-12-22", "TCJA 감세법 서명",       "법인세 35→21% 인하, 기업이익 급증",                   "📝", "up"),
-    # 2018
-    ("2018-02-05", "VIX 폭발 (볼마겟돈)",    "변동성 상품 붕괴 → 하루 -4%, XIV 청산",               "💣", "down"),
-    ("2018-10-01", "미중 무역전쟁 격화",      "관세 확대 → 불확실성 급등, Q4 -14%",                  "⚔️", "down"),
-    ("2018-12-24", "파월 피벗",              "금리 인상 중단 시사 → 크리스마스 랠리",                "🔄", "up"),
-    # 2019
-    ("2019-07-31", "첫 금리인하 (10년만)",    "보험적 인하 25bp → 경기 확장 연장",                   "📉", "up"),
-    ("2019-09-17", "레포 시장 위기",          "단기자금 금리 10% 급등 → 긴급 유동성 공급",            "🏧", "down"),
-    # 2020
-    ("2020-02-20", "코로나19 팬데믹 시작",    "글로벌 봉쇄 → -34% 역대급 폭락",                     "🦠", "down"),
-    ("2020-03-23", "무제한 QE 선언",         "Fed 무한 양적완화 → V자 반등 시작",                   "💵", "up"),
-    ("2020-11-09", "화이자 백신 발표",        "코로나 백신 성공 → 가치주·소형주 대전환 랠리",         "💉", "up"),
-    # 2021
-    ("2021-11-22", "인플레 피크 & 긴축 예고", "CPI 7%대, 테이퍼링 예고 → 성장주 하락 전환",           "📉", "down"),
-    # 2022
-    ("2022-01-26", "Fed 매파 전환",          "'곧 금리 인상' 시사 → 나스닥 -15%",                   "🦅", "down"),
-    ("2022-02-24", "러-우 전쟁 개전",         "에너지 위기 → 스태그플레이션 공포",                    "💥", "down"),
-    ("2022-03-16", "긴축 사이클 개시",        "첫 25bp 인상 → 11회 연속 인상 시작, 총 525bp",         "⬆️", "down"),
-    ("2022-06-13", "S&P 약세장 진입",        "고점 대비 -20% 돌파, 빅테크 폭락",                     "🐻", "down"),
-    ("2022-10-13", "CPI 피크아웃",           "인플레 둔화 확인 → 하락장 바닥 형성",                  "📊", "up"),
-    ("2022-11-30", "ChatGPT 출시",          "생성형 AI 시대 개막 → AI 투자 광풍의 기폭제",           "🧠", "up"),
-    # 2023
-    ("2023-01-19", "S&P 강세장 전환",        "전고점 돌파 → 공식 강세장 진입",                       "🐂", "up"),
-    ("2023-03-12", "SVB 은행 위기",          "실리콘밸리은행 파산 → 긴급 유동성 투입(BTFP)",          "🏦", "down"),
-    ("2023-10-27", "금리 고점 공포",          "10년물 5% 돌파 → S&P 200일선 이탈",                   "📈", "down"),
-    # 2024
-    ("2024-02-22", "NVIDIA 실적 서프라이즈",   "AI 매출 폭증 → 시총 $2T 돌파, AI 랠리 가속",          "🚀", "up"),
-    ("2024-08-05", "엔 캐리트레이드 청산",     "일본 금리인상 → 글로벌 디레버리징, VIX 65",            "🇯🇵", "down"),
-    ("2024-09-18", "연준 빅컷 (50bp)",       "금리인하 사이클 개시, 소형주 급등",                    "✂️", "up"),
-    ("2024-11-05", "트럼프 2기 당선",         "감세·규제완화 기대 → 지수 역대 신고가",                "🗳️", "up"),
-    # 2025
-    ("2025-01-27", "DeepSeek AI 쇼크",       "중국 저비용 AI 모델 → 반도체주 폭락 (NVDA -17%)",     "🤖", "down"),
-    ("2025-04-02", "Liberation Day 관세",    "전방위 관세 발표 → 이틀간 -10%, VIX 60",              "🚨", "down"),
-    ("2025-04-09", "관세 90일 유예",          "트럼프 관세 일시중단 → 역대급 반등 +9.5%",             "🕊️", "up"),
-    ("2025-05-12", "미중 제네바 관세 합의",    "상호관세 125→10% 인하 → S&P +3.2%, 무역전쟁 완화",    "🤝", "up"),
-    ("2025-07-04", "OBBBA 법안 통과",        "감세 연장·R&D 비용처리 → 기업이익 전망 상향",           "📜", "up"),
-    ("2025-10-29", "QT 종료 발표",           "12/1부터 대차대조표 축소 중단",                       "🛑", "up"),
-    ("2025-12-11", "RMP 국채매입 재개",       "준비금 관리 매입 개시 → 유동성 확장 전환",              "💰", "up"),
-    # 2026
-    ("2026-01-28", "S&P 7000 돌파",          "14개월 만에 +1,000pt, AI 슈퍼사이클 & OBBBA 효과",    "🏆", "up"),
-]
-
-MARKET_PIVOTS_KR = [
-    # 2015
-    ("2015-08-24", "중국발 블랙먼데이",       "위안 절하 → KOSPI 1,830선 붕괴, 외국인 대량 매도",     "🇨🇳", "down"),
-    # 2016
-    ("2016-11-08", "트럼프 1기 당선",        "신흥국 자금유출 우려 → KOSPI 2,000선 하회",           "🗳️", "down"),
-    ("2016-12-09", "박근혜 탄핵 가결",        "정치 불확실성 해소 기대 → 증시 반등",                 "⚖️", "up"),
-    # 2017
-    ("2017-05-10", "문재인 대통령 취임",      "경기부양 기대 → KOSPI 2,300 돌파 랠리",              "🏛️", "up"),
-    ("2017-09-03", "북한 6차 핵실험",         "지정학 리스크 → KOSPI 급락 후 빠른 회복",             "🚀", "down"),
-    # 2018
-    ("2018-04-27", "남북 판문점 정상회담",     "한반도 평화 기대 → 코리아 디스카운트 축소",            "🤝", "up"),
-    ("2018-10-01", "미중 무역전쟁 격화",      "수출주 직격탄 → KOSPI 2,000선 붕괴",                 "⚔️", "down"),
-    # 2019
-    ("2019-07-01", "일본 수출규제",           "반도체 소재 수출 제한 → 삼성·SK 타격",                "🇯🇵", "down"),
-    # 2020
-    ("2020-03-19", "코스피 서킷브레이커",     "코로나 패닉 → KOSPI 1,457 저점, 사이드카 발동",       "🦠", "down"),
-    ("2020-03-23", "한은 긴급 기준금리 인하", "0.75%로 빅컷 → 유동성 공급 확대",                    "💵", "up"),
-    ("2020-05-28", "동학개미운동",           "개인투자자 대거 유입 → KOSPI 반등 주도",              "🐜", "up"),
-    ("2020-11-09", "화이자 백신 발표",        "수출주 회복 기대 → KOSPI 2,500 돌파",                "💉", "up"),
-    # 2021
-    ("2021-01-07", "KOSPI 3,000 돌파",       "역사상 첫 3,000 안착 → 개인 순매수 주도",             "🏆", "up"),
-    ("2021-06-24", "KOSPI 3,300 역대 최고",   "글로벌 유동성 피크 → 바이오·2차전지 과열",             "📈", "up"),
-    ("2021-11-22", "긴축 예고 & 하락 전환",   "금리인상 시작 → 성장주·소형주 급락",                   "📉", "down"),
-    # 2022
-    ("2022-02-24", "러-우 전쟁 개전",         "에너지 수입국 한국 직격 → KOSPI 2,600선 붕괴",        "💥", "down"),
-    ("2022-06-23", "한은 빅스텝 (50bp)",      "기준금리 1.75→2.25%, 긴축 가속",                    "⬆️", "down"),
-    ("2022-09-26", "KOSPI 2,200 붕괴",       "강달러·긴축 → 연중 최저, 외국인 연속 매도",            "🐻", "down"),
-    ("2022-11-30", "ChatGPT 출시",           "AI 수혜주(삼성·SK) 반등 기대감",                     "🧠", "up"),
-    # 2023
-    ("2023-01-30", "한은 금리 동결 전환",     "3.50% 정점 시사 → 금리 인상 사이클 종료",              "🔄", "up"),
-    ("2023-05-30", "KOSPI 2,600 회복",       "반도체 업황 회복 기대 → 삼성전자 주도 반등",            "📊", "up"),
-    # 2024
-    ("2024-01-02", "밸류업 프로그램 발표",    "PBR 1배 미만 기업 개선 요구 → 저PBR주 급등",           "📋", "up"),
-    ("2024-08-05", "엔 캐리트레이드 청산",    "글로벌 디레버리징 → KOSPI -8.8% 블랙먼데이",          "🇯🇵", "down"),
-    ("2024-12-03", "윤석열 비상계엄 선포",    "정치 위기 → KOSPI 급락, 원화 1,440원 돌파",           "🚨", "down"),
-    ("2024-12-14", "윤석열 탄핵 가결",        "불확실성 정점 후 정치 리스크 일부 해소",               "⚖️", "up"),
-    # 2025
-    ("2025-01-27", "DeepSeek AI 쇼크",       "중국 AI 충격 → 삼성전자·SK하이닉스 급락",             "🤖", "down"),
-    ("2025-04-02", "Liberation Day 관세",    "한국산 제품 25% 관세 → 수출주 폭락, KOSPI -4%",       "🚨", "down"),
-    ("2025-04-09", "관세 90일 유예",          "한국 포함 유예 → KOSPI +5% 반등",                    "🕊️", "up"),
-    ("2025-05-12", "미중 관세 합의",          "글로벌 무역 완화 → 한국 수출 수혜 기대",               "🤝", "up"),
-    ("2025-06-03", "한은 기준금리 2.50% 인하", "경기 부양 위해 추가 인하 → 유동성 확대",              "✂️", "up"),
-]
-
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 국가별 설정
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-COUNTRY_CONFIG = {
-    "🇺🇸 미국": {
-        "indices": {"NASDAQ": "^IXIC", "S&P 500": "^GSPC", "다우존스": "^DJI"},
-        "default_idx": 0,
-        "fred_liq": "BOGMBASE",      # 본원통화 (Billions of USD — FRED 단위 그대로)
-        "fred_rec": "USREC",          # 경기침체 지표
-        "liq_divisor": 1,             # 이미 $B 단위
-        "liq_label": "본원통화",
-        "liq_unit": "$B",
-        "liq_prefix": "$",
-        "liq_suffix": "B",
-        "events": MARKET_PIVOTS,
-        "data_src": "Federal Reserve (FRED) · Yahoo Finance",
-    },
-    "🇰🇷 대한민국": {
-        "indices": {"KOSPI": "^KS11", "KOSDAQ": "^KQ11"},
-        "default_idx": 0,
-        "fred_liq": "BOGMBASE",        # Fed 본원통화 = 글로벌 유동성 지표
-        "fred_rec": "USREC",           # 미국 경기침체 (글로벌 영향)
-        "liq_divisor": 1,              # 이미 $B 단위
-        "liq_label": "글로벌 유동성 (Fed)",
-        "liq_unit": "$B",
-        "liq_prefix": "$",
-        "liq_suffix": "B",
-        "events": MARKET_PIVOTS_KR,
-        "data_src": "Federal Reserve (FRED) · Yahoo Finance (KRX)",
-    },
-}
+# 캐시는 data_version(경계 시각)으로 갱신되므로 TTL은 오래된 버전 정리용 (경계 간 최대 8시간)
+CACHE_TTL = 12 * 3600
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_data(ticker, fred_liq, fred_rec, liq_divisor):
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sources(tickers, fred_codes, version):
+    """FRED · Yahoo 전체 동시 수집 → 국가/지수 전환 시 네트워크 대기 없음"""
+    mark_miss()
+    end_dt = datetime.now()
+    fetch_start = end_dt - timedelta(days=365 * FETCH_YEARS)
+    with span("fetch"):
+        return fetch_all(tickers, fred_codes, fetch_start, end_dt)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_fred(fred_liq, fred_rec, version):
+    """FRED 유동성·경기침체 시리즈 (지수와 무관 → 같은 코드면 모든 지수가 캐시 공유)"""
+    mark_miss()
+    with span("load_sources", cached=True):
+        fred_all, _, errors = load_sources(ALL_TICKERS, ALL_FRED_CODES, version)
+    if fred_all is None:
+        st.error(f"FRED 데이터 로드 실패: {errors.get('fred')}")
+        return None
+    try:
+        return fred_frame(fred_all, fred_liq, fred_rec)
+    except Exception as e:
+        st.error(f"FRED 데이터 로드 실패: {e}")
+        return None
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_fred_aligned(fred_liq, fred_rec, cal_key, version, _calendar):
+    """FRED 시리즈를 거래일 인덱스에 as-of 결합 (cal_key가 같은 지수는 결합 결과 재사용)"""
+    mark_miss()
+    with span("load_fred", cached=True):
+        fred_df = load_fred(fred_liq, fred_rec, version)
+    if fred_df is None:
+        return None
+    with span("asof_align"):
+        return asof_align(fred_df, _calendar)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_index(ticker, version):
+    """주가 지수 OHLC (yfinance) — 티커별 캐시"""
+    mark_miss()
+    with span("load_sources", cached=True):
+        _, indices, errors = load_sources(ALL_TICKERS, ALL_FRED_CODES, version)
+    if "yahoo" in errors:
+        st.error(f"지수 데이터 로드 실패 (yfinance): {errors['yahoo']}")
+        return None
+    ohlc = indices.get(ticker)
+    if ohlc is None or ohlc.empty:
+        st.error("지수 데이터를 가져오지 못했습니다. (데이터가 비어있음)")
+        return None
+    return ohlc
+
+
+@st.cache_resource(show_spinner=False)
+def rolling_engine(ticker, fred_liq, fred_rec, liq_divisor):
+    """데이터셋별 증분 롤링 엔진 (프로세스 공유 — 다음 버전부터는 새 봉만 계산)"""
+    return RollingEngine()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_data(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """FRED + 지수 결합 및 파생 지표 계산 (원천 데이터는 각 로더 캐시에서 재사용)"""
+    mark_miss()
     try:
         end_dt = datetime.now()
-        fetch_start = end_dt - timedelta(days=365 * 14)
-
-        # [A] FRED 데이터 (유동성)
-        try:
-            fred_codes = [fred_liq]
-            if fred_rec:
-                fred_codes.append(fred_rec)
-            fred_df = web.DataReader(fred_codes, "fred", fetch_start, end_dt).ffill()
-            if fred_rec:
-                fred_df.columns = ["Liquidity", "Recession"]
-            else:
-                fred_df.columns = ["Liquidity"]
-                fred_df["Recession"] = 0
-            fred_df["Liquidity"] = fred_df["Liquidity"] / liq_divisor
-        except Exception as e:
-            st.error(f"FRED 데이터 로드 실패: {e}")
-            return None, None
 
-        # [B] 주가 지수 데이터 (yfinance - OHLC)
-        try:
-            import yfinance as yf
-            yf_data = yf.download(ticker, start=fetch_start, end=end_dt, progress=False)
-            
-            if yf_data.empty:
-                st.error("지수 데이터를 가져오지 못했습니다. (데이터가 비어있음)")
-                return None, None
-            
-            if isinstance(yf_data.columns, pd.MultiIndex):
-                idx_close = yf_data['Close'][[ticker]].rename(columns={ticker: 'SP500'})
-                ohlc = yf_data[[('Open',ticker),('High',ticker),('Low',ticker),('Close',ticker),('Volume',ticker)]].copy()
-                ohlc.columns = ['Open','High','Low','Close','Volume']
-            else:
-                idx_close = yf_data[['Close']].rename(columns={'Close': 'SP500'})
-                ohlc = yf_data[['Open','High','Low','Close','Volume']].copy()
-                
-        except Exception as e:
-            st.error(f"지수 데이터 로드 실패 (yfinance): {e}")
+        # [A] 주가 지수 데이터 (yfinance - OHLC) → 거래일 인덱스
+        with span("load_index", cached=True):
+            ohlc = load_index(ticker, version)
+        if ohlc is None:
             return None, None
+        calendar = trading_calendar(ohlc)
 
-        # [C] 데이터 통합 및 가공
-        df = pd.concat([fred_df, idx_close], axis=1).ffill()
-        
-        if 'SP500' in df.columns:
-            df["Liq_MA"] = df["Liquidity"].rolling(10).mean()
-            df["SP_MA"] = df["SP500"].rolling(10).mean()
-            df["Liq_YoY"] = df["Liquidity"].pct_change(252) * 100
-            df["SP_YoY"] = df["SP500"].pct_change(252) * 100
-        else:
-            st.error("데이터 통합 과정에서 주가 컬럼을 생성하지 못했습니다.")
+        # [B] FRED 데이터 (유동성) — 거래일에 as-of 결합 (같은 달력의 지수끼리 공유)
+        with span("load_fred_aligned", cached=True):
+            fred_df = load_fred_aligned(fred_liq, fred_rec, calendar_key(calendar), version, calendar)
+        if fred_df is None:
             return None, None
 
-        for c in ["Liquidity", "SP500"]:
-            s = df[c].dropna()
-            if len(s) > 0:
-                df[f"{c}_norm"] = (df[c] - s.min()) / (s.max() - s.min()) * 100
-        
-        df["Corr_90d"] = df["Liquidity"].rolling(90).corr(df["SP500"])
+        # [C] 데이터 통합 및 가공 — 같은 거래일 인덱스끼리 결합, 파생 컬럼은 증분 엔진이 새 봉만 반영
+        engine = rolling_engine(ticker, fred_liq, fred_rec, liq_divisor)
+        cut = end_dt - timedelta(days=365 * KEEP_YEARS)
+        with span("transform"):
+            return build_frame(fred_df, ohlc, liq_divisor, engine, EAGER_COLS, cut, COMPACT_COLS, COMPACT_DTYPE)
 
-        cut = end_dt - timedelta(days=365 * 12)
-        df = df[df.index >= pd.to_datetime(cut)]
-        ohlc = ohlc[ohlc.index >= pd.to_datetime(cut)]
-        return df.dropna(subset=["SP500"]), ohlc.dropna(subset=["Close"])
-        
     except Exception as e:
         st.error(f"⚠️ 시스템 오류: {str(e)}")
         return None, None
-        
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 차트 헬퍼
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-C = {
-    "liq": "#3b82f6", "liq_fill": "rgba(59,130,246,0.06)",
-    "sp": "#ef4444", "sp_fill": "rgba(239,68,68,0.04)",
-    "corr_pos": "#10b981", "corr_neg": "#ef4444",
-    "grid": "rgba(226,232,240,0.6)", "bg": "#ffffff", "paper": "#f8fafc",
-    "event": "rgba(148,163,184,0.25)", "rec": "rgba(239,68,68,0.04)",
-}
-BASE_LAYOUT = dict(
-    plot_bgcolor=C["bg"], paper_bgcolor=C["paper"],
-    font=dict(family="Pretendard, sans-serif", color="#475569", size=12),
-    hovermode="x unified",
-    hoverlabel=dict(bgcolor="white", bordercolor="#e2e8f0", font=dict(color="#1e293b", size=12)),
-    # ★ 수정: 상단 여백(t)을 60px로 늘려 툴바 공간 확보
-    margin=dict(t=60, b=30, l=40, r=10), dragmode="pan",
-)
 
-def add_events_to_fig(fig, dff, events, has_rows=False, min_gap_days=30):
-    """이벤트를 차트에 추가. min_gap_days로 최소 간격 제어하여 겹침 방지"""
-    prev_dt = None
-    for date_str, title, _, emoji, direction in events:
-        dt = pd.to_datetime(date_str)
-        if dt < dff.index.min() or dt > dff.index.max():
-            continue
-        # 최소 간격 필터: 이전 이벤트와 너무 가까우면 스킵
-        if prev_dt and (dt - prev_dt).days < min_gap_days:
-            continue
-        prev_dt = dt
-        kw = dict(row="all", col=1) if has_rows else {}
-        fig.add_vline(x=dt, line_width=1, line_dash="dot", line_color=C["event"], **kw)
-        clr = "#10b981" if direction == "up" else "#ef4444"
-        fig.add_annotation(x=dt, y=1.04, yref="paper", text=f"{emoji} {title}",
-            showarrow=False, font=dict(size=11, color=clr), textangle=-38, xanchor="left")
-
-def add_recession(fig, dff, has_rows=False):
-    rec_idx = dff[dff["Recession"] == 1].index
-    if rec_idx.empty:
-        return
-    groups, start = [], rec_idx[0]
-    for i in range(1, len(rec_idx)):
-        if (rec_idx[i] - rec_idx[i - 1]).days > 5:
-            groups.append((start, rec_idx[i - 1])); start = rec_idx[i]
-    groups.append((start, rec_idx[-1]))
-    for s, e in groups:
-        kw = dict(row="all", col=1) if has_rows else {}
-        fig.add_vrect(x0=s, x1=e, fillcolor=C["rec"], layer="below", line_width=0, **kw)
-
-def ax(extra=None):
-    d = dict(gridcolor=C["grid"], linecolor="#e2e8f0", tickfont=dict(size=10), showgrid=True, zeroline=False)
-    if extra: d.update(extra)
-    return d
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_recession_spans(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """데이터셋별 경기침체 구간 (run-length encoding 1회 → 재실행마다 재사용)"""
+    mark_miss()
+    df, _ = load_data(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if df is None:
+        return regime_spans(pd.Series(dtype=float))
+    return regime_spans(df["Recession"])
+
+
+INDICATOR_CACHE_ENTRIES = 64
+
+
+@st.cache_resource
+def indicator_footprints():
+    """지연 계산 지표 캐시 항목별 메모리 (프로세스 공용 — 상태 패널에 표시)"""
+    return FootprintLog(INDICATOR_CACHE_ENTRIES)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=INDICATOR_CACHE_ENTRIES)
+def load_indicator(name, ticker, fred_liq, fred_rec, liq_divisor, version):
+    """레지스트리(LAZY_COLS) 지표 — 처음 읽을 때 계산해 (지표, 데이터셋, 버전)별로 보관"""
+    mark_miss()
+    df, _ = load_data(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if df is None:
+        return None
+    s = lazy_indicator(name, df)
+    indicator_footprints().record((name, ticker, version), s)
+    return s
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_lead_lag(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """데이터셋별 선행·후행 상관 곡면 (창 × 시차 격자 전체를 한 번에 계산) + 칸별 최근 창의 끝 날짜"""
+    mark_miss()
+    df, _ = load_data(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if df is None:
+        return None
+    surface = lead_lag_surface(df["Liquidity"], df["SP500"])
+    end = surface["latest_end"]
+    surface["latest_date"] = np.where(end >= 0, df.index.strftime("%Y-%m-%d").to_numpy()[np.maximum(end, 0)], "")
+    return surface
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_signal_inputs(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """백테스트 · 스윕 입력 (가격, 90일 상관, 3개월 유동성 변화율) — 유동성은 발표일 기준 (미래 정보 없음)"""
+    mark_miss()
+    df, _ = load_data(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if df is None:
+        return None
+    with span("load_sources", cached=True):
+        fred_all, _, _ = load_sources(ALL_TICKERS, ALL_FRED_CODES, version)
+    ohlc = load_index(ticker, version)
+    return (df["SP500"], *release_dated_inputs(fred_all, ohlc, fred_liq, liq_divisor, df.index))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_backtest(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """데이터셋별 Brief 시그널 전 기간 시리즈 + 기본 임계값 백테스트 + 현재 상태"""
+    mark_miss()
+    df, _ = load_data(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if df is None:
+        return None
+    price, corr, liq_chg = load_signal_inputs(ticker, fred_liq, fred_rec, liq_divisor, version)
+    signal = brief_signal(corr, liq_chg)
+    # Daily Brief의 현재 상태는 지금까지 발표된 값 전체(관측일 기준 프레임)로 판정
+    state = int(brief_signal(df["Corr_90d"], liq_change(df["Liquidity"])).iloc[-1])
+    return {"signal": signal, "state": state, **backtest(price, signal)}
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sweep(ticker, fred_liq, fred_rec, liq_divisor, version):
+    """임계값 조합 스윕 (프로세스 풀 — 버튼으로 요청했을 때만, 버전당 1회)"""
+    mark_miss()
+    inputs = load_signal_inputs(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if inputs is None:
+        return None
+    return sweep(*inputs)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_comparison(fred_liq, fred_rec, liq_divisor, version):
+    """설정된 모든 지수의 종가 · 지수별 90일 상관 · 유동성 (컬럼 = 지수명)
+
+    원천은 일괄 수집 캐시(load_sources) 하나에서, 유동성은 전 지수 거래일 합집합에 한 번 as-of 결합,
+    상관은 지수마다 자기 거래일 기준으로(단일 지수 화면의 Corr_90d와 같은 값) 한 번의 벡터 연산으로 계산합니다.
+    """
+    mark_miss()
+    with span("load_sources", cached=True):
+        _, indices, _ = load_sources(ALL_TICKERS, ALL_FRED_CODES, version)
+    with span("load_fred", cached=True):
+        fred_df = load_fred(fred_liq, fred_rec, version)
+    names = {t: name for cfg in COUNTRY_CONFIG.values() for name, t in cfg["indices"].items()}
+    calendars = {t: trading_calendar(indices[t]) for t in ALL_TICKERS if t in indices}
+    if fred_df is None or not calendars:
+        return None
+    union = pd.DatetimeIndex(np.unique(np.concatenate([cal.to_numpy() for cal in calendars.values()])))
+    liq = asof_align(fred_df[["Liquidity"]], union)["Liquidity"] / liq_divisor
+    pairs = [(liq.reindex(cal), indices[t]["Close"].reindex(cal)) for t, cal in calendars.items()]
+    corr = rolling_corr_stacked(pairs, CORR_WINDOW)
+    cut = datetime.now() - timedelta(days=365 * KEEP_YEARS)
+
+    def keep(frame):
+        return frame[frame.index >= cut].astype(COMPACT_DTYPE)
+
+    return {
+        "close": keep(pd.concat({names[t]: p[1] for t, p in zip(calendars, pairs)}, axis=1)),
+        "corr": keep(pd.concat({names[t]: c for t, c in zip(calendars, corr)}, axis=1)),
+        "liquidity": keep(liq),
+    }
 
 
+@st.cache_resource(show_spinner=False)
+def curated_events(country):
+    """국가별 큐레이션 이벤트 표 — 문자열 날짜는 프로세스당 한 번만 파싱"""
+    return event_table(COUNTRY_CONFIG[country]["events"])
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=64)
+def load_events(country, ticker, threshold, version, _ohlc_df):
+    """큐레이션 + 자동 감지 이벤트 표 — (국가, 티커, 임계값, 데이터 버전)별 1회, 위젯 조작 재실행 시 재계산 없음"""
+    mark_miss()
+    curated = curated_events(country)
+    auto = detect_auto_events(_ohlc_df, curated, threshold)
+    return merge_events(curated, event_table(auto, source="auto"))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def load_ohlc_pyramid(ticker, version, _ohlc_df):
+    """일/주/월봉 + MA20/60/120 + 거래량 색상"""
+    mark_miss()
+    return build_ohlc_pyramid(_ohlc_df)
+
+
+def clear_failed(ticker, cfg, version):
+    """실패 결과가 다음 경계까지 캐시에 남지 않도록 해당 버전 항목 제거 → 다음 요청에서 재시도"""
+    load_data.clear(ticker, cfg["fred_liq"], cfg["fred_rec"], cfg["liq_divisor"], version)
+    load_fred.clear(cfg["fred_liq"], cfg["fred_rec"], version)
+    load_fred_aligned.clear()  # 키에 거래일 지문이 들어가므로 전체 제거 (실패 시에만 호출)
+    load_index.clear(ticker, version)
+    load_sources.clear(ALL_TICKERS, ALL_FRED_CODES, version)
+
+
+def _prewarm_jobs():
+    """모든 국가/지수 조합의 캐시 채우기 작업 (실행 시점의 data_version 사용)"""
+    jobs = []
+    for country_name, cfg in COUNTRY_CONFIG.items():
+        for name, ticker in cfg["indices"].items():
+            def job(ticker=ticker, cfg=cfg, country_name=country_name):
+                version = get_data_version()
+                key = (ticker, cfg["fred_liq"], cfg["fred_rec"], cfg["liq_divisor"], version)
+                df, ohlc_raw = load_data(*key)
+                if df is None:
+                    clear_failed(ticker, cfg, version)
+                    raise RuntimeError("데이터 로드 실패")
+                # 첫 방문 화면이 바로 읽는 파생 캐시까지 채움 (선행·후행 곡면이 가장 무거움)
+                load_lead_lag(*key)
+                load_backtest(*key)
+                load_recession_spans(*key)
+                load_events(country_name, ticker, AUTO_EVENT_THRESHOLD, version, ohlc_raw)
+                load_ohlc_pyramid(ticker, version, ohlc_raw)
+                load_comparison(cfg["fred_liq"], cfg["fred_rec"], cfg["liq_divisor"], version)
+            jobs.append((f"{country_name} · {name}", job))
+    return jobs
+
+
+@st.cache_resource(show_spinner=False)
+def start_prewarmer():
+    """프로세스당 하나의 사전 갱신 스레드 (경계 시각마다 모든 지수 캐시 채움)"""
+    return Prewarmer(_prewarm_jobs(), lambda: get_next_refresh()[1]).start()
+
+
+PREWARMER = start_prewarmer()
+        
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 헤더
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -580,6 +637,7 @@ st.markdown(
     f'</div>',
     unsafe_allow_html=True,
 )
+stale_slot = st.container()  # 제공자 장애로 저장본을 대신 보여줄 때의 안내 (데이터 로드 후 채움)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 레이아웃 컨테이너 설정
@@ -617,48 +675,32 @@ period_years = period_map[period]
 cutoff = datetime.now() - timedelta(days=365 * period_years)
 
 with st.spinner(f"{CC['liq_label']} & {idx_name} 데이터를 불러오는 중..."):
-    df, ohlc_raw = load_data(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"])
+    with span("load_data", cached=True, ticker=idx_ticker):
+        df, ohlc_raw = load_data(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"], DATA_VERSION)
 
 if df is None or df.empty:
+    clear_failed(idx_ticker, CC, DATA_VERSION)
     st.error("데이터를 불러올 수 없습니다. 잠시 후 새로고침 해주세요.")
     st.stop()
 
-# ── 자동 이벤트 감지: OHLC ±3% 일변동 자동 추가 ──
-def detect_auto_events(ohlc_df, base_events, threshold=0.05):
-    if ohlc_df is None or ohlc_df.empty or len(ohlc_df) < 2:
-        return []
-    daily_ret = ohlc_df["Close"].pct_change()
-    existing_dates = {pd.to_datetime(d).date() for d, *_ in base_events}
-    auto = []
-    for dt_idx, ret in daily_ret.items():
-        if pd.isna(ret) or dt_idx.date() in existing_dates:
-            continue
-        if abs(ret) < threshold:
-            continue
-        pct = ret * 100
-        if ret > 0:
-            auto.append((dt_idx.strftime("%Y-%m-%d"),
-                f"급등 {pct:+.1f}%", f"하루 {pct:+.1f}% 변동", "🔥", "up"))
-        else:
-            auto.append((dt_idx.strftime("%Y-%m-%d"),
-                f"급락 {pct:+.1f}%", f"하루 {pct:+.1f}% 변동", "⚡", "down"))
-        existing_dates.add(dt_idx.date())
-    return auto
+STALE = get_source().stale()
+if STALE:
+    stale_slot.warning(
+        "⚠️ " + " · ".join(f"{p.upper()} 응답 실패 ({v['since']}부터)" for p, v in STALE.items())
+        + " — 마지막 정상 데이터를 표시 중이며, 백그라운드에서 다시 받으면 자동으로 갱신됩니다.")
 
-BASE_EVENTS = CC["events"]
-AUTO_EVENTS = detect_auto_events(ohlc_raw, BASE_EVENTS)
-ALL_EVENTS = sorted(BASE_EVENTS + AUTO_EVENTS, key=lambda x: x[0])
+# ── 자동 이벤트 감지: OHLC ±5% 일변동 자동 추가 ──
+with span("auto_events", cached=True):
+    ALL_EVENTS = load_events(country, idx_ticker, AUTO_EVENT_THRESHOLD, DATA_VERSION, ohlc_raw)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # KPI
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+KPI = kpis(df)  # 배치 보고서(dashboard.py)와 같은 계산
 with kpi_container:
-    latest = df.dropna(subset=["Liquidity", "SP500"]).iloc[-1]
-    liq_val = latest["Liquidity"]
-    sp_val = latest["SP500"]
-    liq_yoy = latest["Liq_YoY"] if pd.notna(latest.get("Liq_YoY")) else 0
-    sp_yoy = latest["SP_YoY"] if pd.notna(latest.get("SP_YoY")) else 0
-    corr_val = df["Corr_90d"].dropna().iloc[-1] if len(df["Corr_90d"].dropna()) > 0 else 0
+    liq_val, sp_val = KPI["liquidity"], KPI["index"]
+    liq_yoy, sp_yoy = KPI["liq_yoy"], KPI["index_yoy"]
+    corr_val = KPI["corr_90d"]
 
     def delta_html(val):
         cls = "up" if val >= 0 else "down"
@@ -701,19 +743,16 @@ with kpi_container:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 with brief_container:
     today_str = datetime.now().strftime("%Y년 %m월 %d일")
-    liq_3m = df["Liquidity"].dropna()
-    liq_3m_chg = ((liq_3m.iloc[-1] - liq_3m.iloc[-63]) / liq_3m.iloc[-63] * 100) if len(liq_3m) > 63 else 0
-    sp_1m = df["SP500"].dropna()
-    sp_1m_chg = ((sp_1m.iloc[-1] - sp_1m.iloc[-21]) / sp_1m.iloc[-21] * 100) if len(sp_1m) > 21 else 0
-
-    if corr_val > 0.5 and liq_3m_chg > 0:
-        signal_class, signal_text = "signal-bullish", "🟢 유동성 확장 + 강한 상관 → 주가 상승 지지"
-    elif corr_val < 0 or liq_3m_chg < -1:
-        signal_class, signal_text = "signal-bearish", "🔴 유동성 수축 또는 상관 이탈 → 경계 필요"
-    else:
-        signal_class, signal_text = "signal-neutral", "🟡 혼합 시그널 → 방향성 주시"
+    liq_3m_chg, sp_1m_chg = KPI["liq_3m_chg"], KPI["index_1m_chg"]
 
-    if country == "🇺🇸 미국":
+    # 시그널은 전 기간 시리즈(백테스트와 같은 규칙)의 마지막 값
+    with span("backtest", cached=True):
+        bt = load_backtest(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"], DATA_VERSION)
+    signal_state = bt["state"]
+    signal_text = SIGNAL_TEXT[signal_state]
+    signal_class = {BULL: "signal-bullish", BEAR: "signal-bearish"}.get(signal_state, "signal-neutral")
+
+    if country.startswith("🇺🇸"):
         brief_policy = (
             '<strong>▎연준 정책 현황</strong><br>'
             '연방기금금리 <span class="hl">3.50–3.75%</span> 유지 (1/28 FOMC). '
@@ -724,7 +763,7 @@ with brief_container:
         )
         brief_liq = (
             f'<strong>▎유동성 데이터</strong><br>'
-            f'본원통화 최신치 <span class="hl">{liq_display}</span> (YoY {liq_yoy:+.1f}%). '
+            f'{CC["liq_label"]} 최신치 <span class="hl">{liq_display}</span> (YoY {liq_yoy:+.1f}%). '
             f'3개월 변화율 <span class="hl">{liq_3m_chg:+.1f}%</span>. '
             f'QT 종료와 RMP 개시로 유동성 바닥이 형성되었으며, 완만한 확장 추세에 진입했습니다.'
         )
@@ -786,138 +825,88 @@ with brief_container:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 차트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-dff = df[df.index >= pd.to_datetime(cutoff)].copy()
-
-# ── 캔들스틱 OHLC 리샘플 헬퍼 ──
-def resample_ohlc(ohlc_df, rule):
-    """OHLC를 주봉(W) 또는 월봉(ME)으로 리샘플"""
-    return ohlc_df.resample(rule).agg({
-        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'
-    }).dropna()
+dff = slice_from(df, cutoff)
+
+# ── 캔들스틱 OHLC 피라미드 (티커·데이터 버전별 1회 계산 → 기간/봉 변경은 슬라이스만) ──
+TF_RULES = {"일봉": "D", "주봉": "W", "월봉": "ME"}
+
+with span("ohlc_pyramid", cached=True):
+    ohlc_pyramid = load_ohlc_pyramid(idx_ticker, DATA_VERSION, ohlc_raw)
+ohlc_chart = slice_from(ohlc_pyramid[TF_RULES[tf]], cutoff)
+
+# ── 포인트 예산: 트레이스당 전송 점 수 상한 (모바일은 더 작게) → 초과 시 서버에서 축약 ──
+POINT_BUDGET = {"mobile": 600, "desktop": 1500}
+PAYLOAD_TARGET_KB = 300  # 축약 모드의 st.plotly_chart 페이로드 목표
+is_mobile = "Mobi" in (st.context.headers.get("User-Agent") or "")
+point_budget = POINT_BUDGET["mobile" if is_mobile else "desktop"]
+
+chart_slot = st.container()  # 차트는 아래 구간 슬라이더 값이 정해진 뒤 이 위치에 그림
+view_lo, view_hi = ohlc_chart.index[0], ohlc_chart.index[-1]
+if len(ohlc_chart) > point_budget:
+    # 구간을 좁히면 해당 구간을 원본 해상도로 다시 잘라 씀 (예산 이내가 되면 축약 해제)
+    win = st.slider("🔍 구간 (좁히면 원본 해상도)",
+                    min_value=view_lo.date(), max_value=view_hi.date(),
+                    value=(view_lo.date(), view_hi.date()), format="YYYY.MM.DD",
+                    key=f"chart_window_{idx_ticker}_{period}_{tf}")
+    view_lo, view_hi = pd.Timestamp(win[0]), pd.Timestamp(win[1])
+ohlc_view = ohlc_chart.loc[view_lo:view_hi]
+dff_view = dff.loc[view_lo:view_hi]
+decimated = len(ohlc_view) > point_budget
+
+# ── 차트 Figure 메모이즈: (국가, 지수, 기간, 봉, 구간, 예산, 데이터 버전) → 같은 조합은 재생성 없음 ──
+# 이벤트는 캐시된 기본 Figure 위에 덧붙이는 오버레이 → 이벤트 토글이 캔들 재생성을 부르지 않음
+FIGURE_CACHE_ENTRIES = 16  # Figure는 크므로 최근 조합만 보관 (LRU)
+CHART_CONFIG = {"scrollZoom": True,
+                "displayModeBar": True,
+                "modeBarButtonsToRemove": [
+                    "select2d", "lasso2d", "autoScale2d",
+                    "hoverClosestCartesian", "hoverCompareCartesian",
+                    "toggleSpikelines",
+                ],
+                "displaylogo": False,
+                "responsive": True}
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_candle_figure(country, idx_name, period, tf, window, point_budget, version,
+                       _ohlc_view, _dff_view, _rec_spans):
+    """이벤트 없는 캔들 Figure와 페이로드 크기(KB, 축약 시에만) — 객체를 그대로 공유하므로 호출 측에서 수정하지 말 것"""
+    mark_miss()
+    cfg = COUNTRY_CONFIG[country]
+    fig = build_candle_figure(
+        _ohlc_view, _dff_view, point_budget, idx_name, cfg["liq_label"], cfg["liq_unit"], cfg["liq_suffix"],
+        rec_spans=_rec_spans)
+    # 페이로드 크기는 직렬화 비용이 있으므로 축약 안내가 필요할 때만 (조합당 1회)
+    payload_kb = len(fig.to_json()) / 1024 if len(_ohlc_view) > point_budget else None
+    return fig, payload_kb
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_event_figure(country, idx_name, period, tf, window, point_budget, version,
+                      _ohlc_view, _dff_view, _rec_spans, _events):
+    """기본 캔들 Figure(캐시)를 복사해 이벤트만 덧붙인 Figure — 이벤트를 켤 때 캔들은 다시 그리지 않음"""
+    mark_miss()
+    base, payload_kb = load_candle_figure(country, idx_name, period, tf, window, point_budget, version,
+                                          _ohlc_view, _dff_view, _rec_spans)
+    fig = with_events(base, _ohlc_view, _events, True, EVENT_MIN_GAP_DAYS.get(tf, 30))
+    return fig, payload_kb and len(fig.to_json()) / 1024
+
+with span("recession_spans", cached=True):
+    rec_spans = load_recession_spans(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"], DATA_VERSION)
+with span("figure_build", cached=True, bars=len(ohlc_view)):
+    figure_key = (country, idx_name, period, tf, (view_lo, view_hi), point_budget, DATA_VERSION,
+                  ohlc_view, dff_view, rec_spans)
+    if show_events:
+        fig_candle, payload_kb = load_event_figure(*figure_key, ALL_EVENTS)
+    else:
+        fig_candle, payload_kb = load_candle_figure(*figure_key)
 
-# 기간 필터링된 OHLC 데이터
-ohlc_filtered = ohlc_raw[ohlc_raw.index >= pd.to_datetime(cutoff)].copy()
-
-if tf == "주봉":
-    ohlc_chart = resample_ohlc(ohlc_filtered, "W")
-elif tf == "월봉":
-    ohlc_chart = resample_ohlc(ohlc_filtered, "ME")
-else:
-    ohlc_chart = ohlc_filtered.copy()
-
-# 이동평균 (20, 60, 120 — 봉 주기에 맞게)
-for ma_len in [20, 60, 120]:
-    ohlc_chart[f"MA{ma_len}"] = ohlc_chart["Close"].rolling(ma_len).mean()
-
-# 거래량 색상
-vol_colors = ["#ef4444" if c < o else "#10b981"
-              for o, c in zip(ohlc_chart["Open"], ohlc_chart["Close"])]
-
-fig_candle = make_subplots(
-    rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03,
-    row_heights=[0.75, 0.25],
-    specs=[[{"secondary_y": True}], [{"secondary_y": False}]])
-
-# 유동성 (우측 Y축, 배경 영역) — 캔들 뒤에 깔기
-liq_series = dff["Liq_MA"].dropna()
-liq_hover_fmt = f"%{{y:,.0f}}{CC['liq_suffix']}<extra>{CC['liq_label']}</extra>"
-fig_candle.add_trace(go.Scatter(
-    x=liq_series.index, y=liq_series, name=f"{CC['liq_label']} ({CC['liq_unit']})",
-    fill="tozeroy", fillcolor="rgba(59,130,246,0.07)",
-    line=dict(color="rgba(59,130,246,0.4)", width=1.5),
-    hovertemplate=liq_hover_fmt
-), row=1, col=1, secondary_y=True)
-
-# 캔들스틱
-fig_candle.add_trace(go.Candlestick(
-    x=ohlc_chart.index,
-    open=ohlc_chart["Open"], high=ohlc_chart["High"],
-    low=ohlc_chart["Low"], close=ohlc_chart["Close"],
-    increasing_line_color="#10b981", increasing_fillcolor="#10b981",
-    decreasing_line_color="#ef4444", decreasing_fillcolor="#ef4444",
-    name=idx_name, whiskerwidth=0.4,
-), row=1, col=1)
-
-# 이동평균선
-ma_colors = {"MA20": "#f59e0b", "MA60": "#3b82f6", "MA120": "#8b5cf6"}
-for ma_name, ma_color in ma_colors.items():
-    s = ohlc_chart[ma_name].dropna()
-    if len(s) > 0:
-        fig_candle.add_trace(go.Scatter(
-            x=s.index, y=s, name=ma_name,
-            line=dict(color=ma_color, width=1.3),
-            hovertemplate="%{y:,.0f}<extra>" + ma_name + "</extra>"
-        ), row=1, col=1)
-
-# 거래량
-fig_candle.add_trace(go.Bar(
-    x=ohlc_chart.index, y=ohlc_chart["Volume"], name="거래량",
-    marker_color=vol_colors, opacity=0.5, showlegend=False,
-    hovertemplate="%{y:,.0f}<extra>Volume</extra>"
-), row=2, col=1)
-
-# 이벤트 표시 (봉 주기에 따라 최소 간격 조절)
-if show_events:
-    gap_map = {"일봉": 14, "주봉": 45, "월봉": 120}
-    min_gap = gap_map.get(tf, 30)
-    prev_dt = None
-    for date_str, title, _, emoji, direction in ALL_EVENTS:
-        dt = pd.to_datetime(date_str)
-        if dt < ohlc_chart.index.min() or dt > ohlc_chart.index.max():
-            continue
-        if prev_dt and (dt - prev_dt).days < min_gap:
-            continue
-        prev_dt = dt
-        fig_candle.add_vline(x=dt, line_width=1, line_dash="dot",
-            line_color=C["event"], row="all", col=1)
-        clr = "#10b981" if direction == "up" else "#ef4444"
-        fig_candle.add_annotation(x=dt, y=1.04, yref="paper",
-            text=f"{emoji} {title}", showarrow=False,
-            font=dict(size=11, color=clr), textangle=-38, xanchor="left")
-
-# 리세션 음영
-add_recession(fig_candle, dff, True)
-
-# ★ 수정: 범례를 차트 안쪽 좌측 상단으로 이동, 배경 추가
-fig_candle.update_layout(
-    **BASE_LAYOUT, height=700, showlegend=True,
-    legend=dict(
-        yanchor="top", y=0.99,
-        xanchor="left", x=0.01,
-        font=dict(size=11),
-        bgcolor="rgba(255,255,255,0.5)", # 반투명 배경
-        bordercolor="rgba(0,0,0,0.1)",
-        borderwidth=1
-    ),
-    xaxis_rangeslider_visible=False,
-)
-fig_candle.update_xaxes(ax(), row=1, col=1)
-fig_candle.update_xaxes(ax(), row=2, col=1)
-# ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
-fig_candle.update_yaxes(ax(dict(title=None, ticklabelposition="outside", automargin=True)), row=1, col=1, secondary_y=False)
-# 유동성 Y축 범위 계산: 데이터 하한 기반으로 동적 설정
-liq_min_val = liq_series.min()
-liq_max_val = liq_series.max()
-liq_y_min = liq_min_val * 0.85  # 하한 15% 여유
-liq_y_max = liq_y_min + (liq_max_val - liq_y_min) / 0.6  # 변동 시각화 확대
-
-# ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
-fig_candle.update_yaxes(ax(dict(title=None,
-    title_font=dict(color="#3b82f6"), tickfont=dict(color="#3b82f6", size=10),
-    showgrid=False, range=[liq_y_min, liq_y_max], ticklabelposition="outside", automargin=True)), row=1, col=1, secondary_y=True)
-# ★ 수정: 차트 축 라벨 텍스트 제거 (title=None) + 바깥쪽 배치(outside) + 자동 마진
-fig_candle.update_yaxes(ax(dict(title=None, tickformat=".2s", fixedrange=True, ticklabelposition="outside", automargin=True)), row=2, col=1)
-
-st.plotly_chart(fig_candle, use_container_width=True,
-                config={"scrollZoom": True,
-                        "displayModeBar": True,
-                        "modeBarButtonsToRemove": [
-                            "select2d", "lasso2d", "autoScale2d",
-                            "hoverClosestCartesian", "hoverCompareCartesian",
-                            "toggleSpikelines",
-                        ],
-                        "displaylogo": False,
-                        "responsive": True})
+with chart_slot, span("plotly_chart"):
+    if tracing.active():  # 축약하지 않은 Figure는 계측 중일 때만 직렬화해 크기 기록
+        note(payload_kb=round(payload_kb or len(fig_candle.to_json()) / 1024, 1))
+    st.plotly_chart(fig_candle, use_container_width=True, config=CHART_CONFIG)
+    if decimated:
+        st.caption(f"⚡ 경량 표시: {point_budget:,}/{len(ohlc_view):,}봉 · "
+                   f"페이로드 {payload_kb:,.0f}KB (목표 {PAYLOAD_TARGET_KB}KB) · 구간을 좁히면 원본 해상도")
 
 # 모바일 핀치 줌 강제 활성화 (JS 주입)
 st.markdown("""
@@ -954,21 +943,180 @@ if len(ohlc_chart) >= 2:
         unsafe_allow_html=True,
     )
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 전체 지수 비교 (정규화 성과 · 지수별 90일 상관, WebGL)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_comparison_figure(country, period, point_budget, version, _cutoff):
+    """전체 지수 비교 Figure와 요약 표 (데이터 없으면 None) — 공유 객체이므로 호출 측에서 수정하지 말 것"""
+    mark_miss()
+    cfg = COUNTRY_CONFIG[country]
+    cmp_data = load_comparison(cfg["fred_liq"], cfg["fred_rec"], cfg["liq_divisor"], version)
+    if cmp_data is None:
+        return None
+    cmp_close = slice_from(cmp_data["close"], _cutoff)
+    cmp_liq = slice_from(cmp_data["liquidity"], _cutoff)
+    # 기간 시작(지수별 첫 유효값) = 100
+    cmp_perf = cmp_close / cmp_close.bfill().iloc[0] * 100
+    liq_perf = cmp_liq / cmp_liq.dropna().iloc[0] * 100
+    # 지수마다 성과 · 상관 트레이스가 겹쳐 그려지므로 트레이스당 예산은 메인 차트의 1/4
+    fig = build_comparison_figure(cmp_perf, slice_from(cmp_data["corr"], _cutoff), liq_perf, cfg["liq_label"],
+                                  point_budget // 4)
+    summary = pd.DataFrame({
+        f"{period} 수익(%)": cmp_perf.ffill().iloc[-1] - 100,
+        f"{CORR_WINDOW}일 상관": cmp_data["corr"].ffill().iloc[-1],
+    }).astype(float).round(2)
+    return fig, summary
+
+
+with st.expander(f"🗂️ 전체 지수 비교 · {CC['liq_label']}"):
+    # 접힌 expander 본문도 매 실행마다 돌므로, 켰을 때만 불러와 그림
+    cmp_fig = None
+    if st.toggle("비교 차트 보기", key="show_comparison"):
+        with span("comparison", cached=True):
+            cmp_fig = load_comparison_figure(country, period, point_budget, DATA_VERSION, cutoff)
+        if cmp_fig is None:
+            st.caption("비교 데이터를 불러오지 못했습니다.")
+    else:
+        st.caption(f"설정된 모든 지수의 {period} 성과와 지수별 {CORR_WINDOW}일 상관을 한 화면에 그립니다.")
+    if cmp_fig is not None:
+        fig_cmp, summary = cmp_fig
+        st.plotly_chart(fig_cmp, use_container_width=True, config={"displayModeBar": False})
+        st.caption(f"위: {period} 시작 = 100 기준 성과 · 아래: 지수별 {CORR_WINDOW}일 롤링 상관 ({CC['liq_label']} 대비)")
+        st.dataframe(summary, use_container_width=True)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 정규화 비교 (기간 최저 = 0, 최고 = 100) — 레지스트리 지표를 켰을 때만 계산
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_normalized_figure(country, ticker, idx_name, period, point_budget, version, _cutoff):
+    """유동성 · 지수 정규화 겹침 Figure — 공유 객체이므로 호출 측에서 수정하지 말 것"""
+    mark_miss()
+    cfg = COUNTRY_CONFIG[country]
+    key = (ticker, cfg["fred_liq"], cfg["fred_rec"], cfg["liq_divisor"], version)
+    liq_norm = load_indicator("Liquidity_norm", *key)
+    sp_norm = load_indicator("SP500_norm", *key)
+    if liq_norm is None or sp_norm is None:
+        return None
+    return build_normalized_figure(slice_from(liq_norm, _cutoff), slice_from(sp_norm, _cutoff),
+                                   cfg["liq_label"], idx_name, point_budget)
+
+
+with st.expander(f"📐 정규화 비교 · {CC['liq_label']} vs {idx_name}"):
+    if st.toggle("정규화 차트 보기", key="show_normalized"):
+        with span("normalized", cached=True):
+            fig_norm = load_normalized_figure(country, idx_ticker, idx_name, period, point_budget, DATA_VERSION,
+                                              cutoff)
+        if fig_norm is None:
+            st.caption("정규화 지표를 계산하지 못했습니다.")
+        else:
+            st.plotly_chart(fig_norm, use_container_width=True, config={"displayModeBar": False})
+            st.caption(f"보관 기간 전체의 최저 = 0, 최고 = 100 기준 · 표시는 {period}")
+    else:
+        st.caption("단위가 다른 유동성과 지수를 같은 0~100 척도로 겹쳐 그립니다.")
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 선행·후행 상관 (창 × 시차 히트맵)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_lead_lag_figure(ticker, fred_liq, fred_rec, liq_divisor, mode, version):
+    """선행·후행 히트맵 Figure · 격자 z · 칸별 창 끝 날짜(최근 창만, 평균은 None) (mode = "latest" | "mean")
+
+    데이터가 없으면 None. 공유 객체이므로 호출 측에서 수정하지 말 것
+    """
+    mark_miss()
+    surface = load_lead_lag(ticker, fred_liq, fred_rec, liq_divisor, version)
+    if surface is None:
+        return None
+    dates = surface["latest_date"] if mode == "latest" else None
+    return build_lead_lag_figure(surface[mode], LEAD_LAG_LAGS, LEAD_LAG_WINDOWS), surface[mode], dates
+
+
+with st.expander(f"🧭 {CC['liq_label']} 선행·후행 상관 히트맵"):
+    # 곡면 계산이 무거우므로 켰을 때만 (접힌 expander 본문도 매 실행마다 돎)
+    if st.toggle("히트맵 보기", key="show_lead_lag"):
+        ll_mode = st.radio("기준", ["최근 창", "전 기간 평균"], horizontal=True, key="lead_lag_mode")
+        with span("lead_lag", cached=True):
+            lead_lag = load_lead_lag_figure(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"],
+                                            "latest" if ll_mode == "최근 창" else "mean", DATA_VERSION)
+        if lead_lag is None:
+            st.caption("선행·후행 상관을 계산하지 못했습니다.")
+        else:
+            fig_ll, z, ends = lead_lag
+            st.plotly_chart(fig_ll, use_container_width=True, config={"displayModeBar": False})
+            if np.isfinite(z).any():
+                li, wi = np.unravel_index(np.nanargmax(np.abs(z)), z.shape)
+                end_txt = f" (창 끝 {ends[li, wi]})" if ends is not None else ""
+                st.caption(f"|상관| 최대: 시차 {LEAD_LAG_LAGS[li]:+d}일 · 창 {LEAD_LAG_WINDOWS[wi]}일 → "
+                           f"{z[li, wi]:+.3f}{end_txt}")
+            if ends is not None and (ends != "").any():
+                first, last = ends[ends != ""].min(), ends[ends != ""].max()
+                st.caption(f"최근 창 끝: {last}" if first == last else
+                           f"최근 창 끝: {first} ~ {last} (음수 시차 · 결측 구간은 더 이른 창이 마지막)")
+    else:
+        st.caption("유동성이 지수보다 몇 거래일 앞서거나 뒤따를 때 상관이 가장 큰지, 롤링 창 길이별로 봅니다.")
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Brief 시그널 백테스트
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def load_equity_figure(ticker, fred_liq, fred_rec, liq_divisor, idx_name, point_budget, version):
+    """백테스트 자산 곡선 Figure — 공유 객체이므로 호출 측에서 수정하지 말 것"""
+    mark_miss()
+    bt = load_backtest(ticker, fred_liq, fred_rec, liq_divisor, version)
+    return build_equity_figure(bt["equity"], idx_name, point_budget)
+
+
+with st.expander("🧪 Brief 시그널 백테스트"):
+    th = DEFAULT_THRESHOLDS
+    st.caption(
+        f"강세: 상관 > {th['corr_bull']} 그리고 3개월 유동성 변화 > {th['liq_bull']}% · "
+        f"약세: 상관 < {th['corr_bear']} 또는 변화 < {th['liq_bear']}% · "
+        f"노출 강세 {EXPOSURE[BULL]:.0%} / 중립 {EXPOSURE[0]:.0%} / 약세 {EXPOSURE[BEAR]:.0%} (다음 거래일 적용) · "
+        f"유동성은 발표일 기준 (FRED 발표 시차 반영)"
+    )
+    # 자산 곡선 · 표는 켰을 때만 그림 (접힌 expander 본문도 매 실행마다 돌기 때문)
+    if st.toggle("백테스트 결과 보기", key="show_backtest"):
+        with span("backtest_figure", cached=True):
+            fig_bt = load_equity_figure(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"], idx_name,
+                                        point_budget, DATA_VERSION)
+        st.plotly_chart(fig_bt, use_container_width=True, config={"displayModeBar": False})
+
+        stats = bt["stats"]
+        st.dataframe(pd.DataFrame([stats]).round(1), hide_index=True, use_container_width=True)
+        st.caption(f"시그널 상태별 선행 수익률 (적중률 = 강세/약세일의 {HIT_HORIZON}일 선행 수익 방향 일치 비율)")
+        st.dataframe(bt["forward"].round(2), use_container_width=True)
+
+        if st.button("⚙️ 임계값 스윕 실행", key="run_sweep"):
+            with st.spinner("임계값 조합 백테스트 중..."):
+                with span("sweep", cached=True):
+                    sweep_df = load_sweep(idx_ticker, CC["fred_liq"], CC["fred_rec"], CC["liq_divisor"],
+                                          DATA_VERSION)
+            st.dataframe(sweep_df.head(20).round(2), hide_index=True, use_container_width=True)
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 이벤트 타임라인
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-st.markdown("""<div class="card">
-    <div class="card-title"><span class="dot" style="background:var(--accent-blue)"></span> 주요 매크로 이벤트 타임라인 ({} 이벤트)</div>
-""".format(sum(1 for d,_,_,_,_ in ALL_EVENTS if pd.to_datetime(d) >= dff.index.min())), unsafe_allow_html=True)
-
-tl_html = '<div class="timeline">'
-for date_str, title, desc, emoji, direction in reversed(ALL_EVENTS):
-    dt = pd.to_datetime(date_str)
-    if dt < dff.index.min():
-        continue
-    dir_cls = "up" if direction == "up" else "down"
-    dir_label = "상승" if direction == "up" else "하락"
-    tl_html += f"""
+TIMELINE_PAGE_SIZE = 20  # 한 번에 보내는 이벤트 행 수 (페이지 단위)
+TL_DIRECTIONS = {"전체": None, "상승": "up", "하락": "down"}
+TL_SOURCES = {"전체": None, "주요 이벤트": "curated", "자동 감지": "auto"}
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=128)
+def timeline_pages(events_key, start, direction, source, _events):
+    """(이벤트 집합, 기간 시작, 방향 · 출처 필터)별 타임라인 HTML 페이지 목록 (최신순) — 조합당 1회만 생성"""
+    mark_miss()
+    ev = select_events(_events, start)
+    if direction:
+        ev = ev[ev["direction"] == direction]
+    if source:
+        ev = ev[ev["source"] == source]
+    rows = zip(ev.index.strftime("%Y-%m-%d")[::-1],
+               *(ev[c].to_numpy()[::-1] for c in ["title", "desc", "emoji", "direction"]))
+    items = []
+    for date_str, title, desc, emoji, direction in rows:
+        dir_cls = "up" if direction == "up" else "down"
+        dir_label = "상승" if direction == "up" else "하락"
+        items.append(f"""
     <div class="tl-item">
         <div class="tl-date">{date_str}</div>
         <div class="tl-icon">{emoji}</div>
@@ -977,9 +1125,75 @@ for date_str, title, desc, emoji, direction in reversed(ALL_EVENTS):
             <div class="tl-desc">{desc}</div>
         </div>
         <div class="tl-dir {dir_cls}">{dir_label}</div>
-    </div>"""
-tl_html += "</div>"
-st.markdown(tl_html + "</div>", unsafe_allow_html=True)
+    </div>""")
+    return ['<div class="timeline">' + "".join(items[i:i + TIMELINE_PAGE_SIZE]) + "</div>"
+            for i in range(0, len(items), TIMELINE_PAGE_SIZE)], len(items)
+
+@st.fragment
+def event_timeline(events_key, start, events):
+    """필터 · 페이지 조작은 이 구간만 다시 실행하고, 보이는 페이지만 전송"""
+    title_slot = st.container()  # 제목의 이벤트 수는 필터가 정해진 뒤 채움
+    f1, f2, f3 = st.columns([1, 1, 1])
+    with f1:
+        direction = st.selectbox("방향", list(TL_DIRECTIONS), key="tl_direction")
+    with f2:
+        source = st.selectbox("출처", list(TL_SOURCES), key="tl_source")
+    with span("timeline", cached=True):
+        pages, total = timeline_pages(events_key, start, TL_DIRECTIONS[direction], TL_SOURCES[source], events)
+    page = 0
+    if len(pages) > 1:
+        with f3:
+            page = st.selectbox("페이지", range(len(pages)),
+                                format_func=lambda i: f"{i + 1} / {len(pages)} "
+                                                      f"({i * TIMELINE_PAGE_SIZE + 1}–{min((i + 1) * TIMELINE_PAGE_SIZE, total)})")
+
+    title_slot.markdown("""<div class="card">
+    <div class="card-title"><span class="dot" style="background:var(--accent-blue)"></span> 주요 매크로 이벤트 타임라인 ({} 이벤트)</div>
+""".format(total), unsafe_allow_html=True)
+    if pages:
+        st.markdown(pages[page] + "</div>", unsafe_allow_html=True)
+    else:
+        st.caption("조건에 맞는 이벤트가 없습니다.")
+
+event_timeline((country, idx_ticker, AUTO_EVENT_THRESHOLD, DATA_VERSION), dff.index.min(), ALL_EVENTS)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 데이터 갱신 상태 (백그라운드 사전 갱신)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+with st.expander(f"🔄 데이터 갱신 상태 · 버전 {DATA_VERSION}"):
+    st.caption(f"데이터 소스: {get_source().describe()}")
+    if get_source().health():
+        st.dataframe(pd.DataFrame(get_source().health()), hide_index=True, use_container_width=True)
+    prewarm_status = PREWARMER.status()
+    if prewarm_status:
+        st.dataframe(pd.DataFrame(prewarm_status), hide_index=True, use_container_width=True)
+    else:
+        st.caption("사전 갱신 진행 중...")
+
+    # 캐시 메모리 — 결합 프레임 컬럼별 (차트 전용 컬럼만 float32)
+    mem = df.memory_usage(deep=True, index=False)
+    mem_rows = [{"데이터셋": f"{idx_ticker} · {DATA_VERSION}", "컬럼": c, "dtype": str(df[c].dtype),
+                 "행": len(df), "KB": round(mem[c] / 1024, 1)} for c in df.columns]
+    st.dataframe(pd.DataFrame(mem_rows), hide_index=True, use_container_width=True)
+    # 지연 계산 지표 — 화면이 읽은 (지표 · 지수 · 버전) 항목만
+    lazy_rows = indicator_footprints().rows()
+    if lazy_rows:
+        st.dataframe(pd.DataFrame(lazy_rows), hide_index=True, use_container_width=True)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 디버그 패널 (?debug=1) — 이번 실행의 단계별 소요 · 캐시 히트/미스
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+if DEBUG:
+    trace = tracing.stop_run()
+    with st.expander(f"🐞 디버그 · 단계별 소요 ({len(trace)} spans)", expanded=True):
+        if trace:
+            trace_df = pd.DataFrame(trace)
+            trace_df["span"] = ["　" * d + n for d, n in zip(trace_df["depth"], trace_df["span"])]
+            top_ms = trace_df.loc[trace_df["depth"] == 0, "ms"].sum()
+            st.caption(f"최상위 단계 합계 {top_ms:,.1f} ms · 구조화 로그: logger '{tracing.logger.name}' "
+                       f"(환경 변수 {tracing.LOG_ENV}=1이면 모든 실행 출력)")
+            st.dataframe(trace_df.drop(columns="depth"), hide_index=True, use_container_width=True)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
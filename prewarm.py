@@ -0,0 +1,56 @@
+"""
+백그라운드 사전 갱신 — 데이터 경계 시각마다 깨어나 모든 국가/지수의 캐시를 미리 채워,
+경계 직후의 첫 방문자도 다운로드·계산 비용 없이 캐시 히트를 받도록 합니다.
+"""
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# 경계 직후 바로 깨어나면 시계 오차로 이전 버전을 데울 수 있으므로 약간 늦게 시작
+WAKE_DELAY_SECS = 30
+
+
+class Prewarmer:
+    """jobs: [(이름, 호출 함수)] · next_wakeup: 다음 경계까지 남은 초를 돌려주는 함수"""
+
+    def __init__(self, jobs, next_wakeup, delay=WAKE_DELAY_SECS):
+        self.jobs = list(jobs)
+        self.next_wakeup = next_wakeup
+        self.delay = delay
+        self._status = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self):
+        self.run_once()  # 프로세스 시작 직후 한 번 — 선택되지 않은 지수도 미리 채움
+        while True:
+            time.sleep(self.next_wakeup() + self.delay)
+            self.run_once()
+
+    def run_once(self):
+        for name, job in self.jobs:
+            t0 = time.perf_counter()
+            try:
+                job()
+                state = "OK"
+            except Exception as e:
+                state = f"실패: {e}"
+            with self._lock:
+                self._status[name] = {
+                    "데이터셋": name,
+                    "갱신 시각": datetime.now(ZoneInfo("Asia/Seoul")).strftime("%m/%d %H:%M:%S"),
+                    "소요(초)": round(time.perf_counter() - t0, 2),
+                    "상태": state,
+                }
+
+    def status(self):
+        """데이터셋별 마지막 갱신 시각 · 소요 시간 · 결과"""
+        with self._lock:
+            return [dict(s) for s in self._status.values()]
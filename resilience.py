@@ -0,0 +1,117 @@
+"""
+제공자 호출 보호 — 전체 마감 시간(재시도 포함), 지터 백오프 재시도, 제공자별 서킷 브레이커.
+
+호출은 작업 스레드에서 실행하고 마감까지만 기다리므로, 제공자가 느려도 호출 측 대기는 마감 시간으로 제한됩니다.
+(마감을 넘긴 요청의 스레드는 끝날 때까지 남지만 결과는 버립니다 — 작업 스레드 풀은 제공자별이라
+응답 없는 제공자가 스레드를 붙잡아도 다른 제공자 호출은 영향을 받지 않습니다)
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from tracing import propagate
+
+TIMEOUT_SECS = 15.0        # 화면 요청 1회(재시도 포함) 마감
+RETRIES = 2                # 실패 후 재시도 횟수 (마감 안에서만)
+BACKOFF_BASE = 0.5         # 재시도 대기 상한 = min(BACKOFF_CAP, BACKOFF_BASE · 2^시도)
+BACKOFF_CAP = 8.0
+BREAKER_FAILURES = 3       # 연속 실패 수 → 차단
+BREAKER_COOLDOWN = 120.0   # 차단 후 이 시간(초)이 지나면 시험 요청 1회 허용
+
+PROVIDER_WORKERS = 4       # 제공자별 작업 스레드 수
+
+_POOLS = {}
+_POOLS_GUARD = threading.Lock()
+
+
+def _pool(name):
+    """제공자(브레이커 이름)별 작업 스레드 풀 — 프로세스당 하나씩"""
+    with _POOLS_GUARD:
+        if name not in _POOLS:
+            _POOLS[name] = ThreadPoolExecutor(max_workers=PROVIDER_WORKERS, thread_name_prefix=f"provider-{name}")
+        return _POOLS[name]
+
+
+class ProviderError(RuntimeError):
+    """제공자 호출 실패 (시간 초과 · 차단 · 재시도 소진)"""
+
+
+class CircuitBreaker:
+    """연속 실패가 쌓이면 cooldown 동안 호출을 막고(open), 이후 시험 요청 1회로 복구 여부를 판단(half-open)"""
+
+    def __init__(self, name, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN, clock=time.monotonic):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self._clock = clock
+        self._fails = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened is None:
+                return True
+            if not self._trial and self._clock() - self._opened >= self.cooldown:
+                self._trial = True  # 시험 요청은 한 번에 하나만
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._fails, self._opened, self._trial = 0, None, False
+
+    def failure(self):
+        with self._lock:
+            self._fails += 1
+            if self._trial or self._fails >= self.failures:
+                self._opened, self._trial = self._clock(), False
+
+    def retry_in(self):
+        """차단 중이면 시험 요청까지 남은 초, 아니면 0"""
+        with self._lock:
+            if self._opened is None:
+                return 0.0
+            return max(self.cooldown - (self._clock() - self._opened), 0.0)
+
+    def status(self):
+        with self._lock:
+            state = "closed" if self._opened is None else "half-open" if self._trial else "open"
+            return {"제공자": self.name, "상태": state, "연속 실패": self._fails}
+
+
+def backoff(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """full jitter — 0 ~ min(cap, base · 2^attempt) 사이 무작위 대기(초). 여러 프로세스의 재시도가 몰리지 않음"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call(fn, breaker, timeout=TIMEOUT_SECS, retries=RETRIES):
+    """fn()을 브레이커 · 마감 시간 · 재시도로 보호해 호출 → 결과. 실패하면 ProviderError
+
+    시도마다 남은 마감을 남은 시도 수로 나눠 기다리므로, 응답 없는 시도도 다른 오류처럼 재시도합니다.
+    브레이커에는 호출 한 번(재시도 포함)을 성공 또는 실패 한 번으로 기록합니다.
+    """
+    if not breaker.allow():
+        raise ProviderError(f"{breaker.name}: 차단 중 (연속 실패, {breaker.retry_in():.0f}초 후 재시도)")
+    deadline = time.monotonic() + timeout
+    last = None
+    for attempt in range(retries + 1):
+        wait = max(deadline - time.monotonic(), 0) / (retries + 1 - attempt)
+        fut = _pool(breaker.name).submit(propagate(fn))
+        try:
+            result = fut.result(timeout=wait)
+        except FutureTimeout:
+            last = TimeoutError(f"{wait:.1f}초 안에 응답 없음")
+        except Exception as e:
+            last = e
+        else:
+            breaker.success()
+            return result
+        delay = backoff(attempt)
+        if attempt == retries or time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+    breaker.failure()
+    raise ProviderError(f"{breaker.name}: {type(last).__name__}: {last}") from last
@@ -0,0 +1,240 @@
+"""
+증분 롤링 통계 — 봉이 추가될 때 파생 컬럼(이동평균 · YoY · 정규화 · 90일 상관)을
+전체 재계산 없이 봉당 O(1)로 갱신합니다. 결과는 pandas 전체 재계산과 허용 오차 내에서 일치합니다.
+"""
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+MA_WINDOW = 10
+YOY_LAG = 252
+CORR_WINDOW = 90
+REBASE_EVERY = 500  # 누적 합의 부동소수 오차가 쌓이지 않도록 주기적으로 창 안에서 다시 합산
+RECHECK_ROWS = 128  # 증분 갱신 때 다시 비교하는 최근 행 수 (저장소 겹침 재수집 · 월간 값의 as-of 전파 구간)
+
+DERIVED_COLS = ["Liq_MA", "SP_MA", "Liq_YoY", "SP_YoY", "Liquidity_norm", "SP500_norm", "Corr_90d"]
+
+
+def derive_full(base, columns=DERIVED_COLS):
+    """전체 재계산 (pandas, 요청된 컬럼만) — 엔진 초기화 및 검증 기준"""
+    calc = {
+        "Liq_MA": lambda: base["Liquidity"].rolling(MA_WINDOW).mean(),
+        "SP_MA": lambda: base["SP500"].rolling(MA_WINDOW).mean(),
+        "Liq_YoY": lambda: base["Liquidity"].pct_change(YOY_LAG) * 100,
+        "SP_YoY": lambda: base["SP500"].pct_change(YOY_LAG) * 100,
+        "Liquidity_norm": lambda: _normalize(base["Liquidity"]),
+        "SP500_norm": lambda: _normalize(base["SP500"]),
+        "Corr_90d": lambda: base["Liquidity"].rolling(CORR_WINDOW).corr(base["SP500"]),
+    }
+    return pd.DataFrame({c: calc[c]() for c in columns}, index=base.index)
+
+
+def _normalize(s):
+    valid = s.dropna()
+    if valid.empty:
+        return s * np.nan
+    return (s - valid.min()) / (valid.max() - valid.min()) * 100
+
+
+class _RollingMean:
+    """창 내 유효값 합 · 개수 (유효값이 창 크기만큼 있어야 값 산출 — pandas min_periods 기본값과 동일)"""
+
+    def __init__(self, window, x=()):
+        self.window = window
+        self.buf = deque(list(x[-window:]), maxlen=window)
+        self._rebase()
+
+    def _rebase(self):
+        vals = [v for v in self.buf if not math.isnan(v)]
+        self.total, self.count, self.pushes = math.fsum(vals), len(vals), 0
+
+    def push(self, x):
+        if len(self.buf) == self.window:
+            old = self.buf[0]
+            if not math.isnan(old):
+                self.total -= old
+                self.count -= 1
+        self.buf.append(x)
+        if not math.isnan(x):
+            self.total += x
+            self.count += 1
+        self.pushes += 1
+        if self.pushes >= REBASE_EVERY:
+            self._rebase()
+        return self.total / self.count if self.count >= self.window else math.nan
+
+
+class _RollingYoY:
+    """lag 봉 전 값 대비 변화율(%) — pandas pct_change(lag)와 동일 (기준값이 0이면 값 없음)"""
+
+    def __init__(self, lag, x=()):
+        self.lag = lag
+        self.buf = deque(list(x[-(lag + 1):]), maxlen=lag + 1)
+
+    def push(self, x):
+        self.buf.append(x)
+        full = len(self.buf) == self.lag + 1 and self.buf[0] != 0
+        return (x / self.buf[0] - 1) * 100 if full else math.nan
+
+
+class _RollingCorr:
+    """창 내 Σx · Σy · Σx² · Σy² · Σxy (두 값 모두 유효한 쌍만) → 피어슨 상관
+
+    큰 수의 제곱합에서 생기는 상쇄 오차를 줄이려고 기준값(shift)을 뺀 값으로 누적합니다.
+    """
+
+    def __init__(self, window, x=(), y=()):
+        self.window = window
+        self.buf = deque(zip(list(x[-window:]), list(y[-window:])), maxlen=window)
+        self._rebase()
+
+    def _rebase(self):
+        pairs = [(x, y) for x, y in self.buf if not (math.isnan(x) or math.isnan(y))]
+        n = len(pairs)
+        self.kx = math.fsum(x for x, _ in pairs) / n if n else 0.0
+        self.ky = math.fsum(y for _, y in pairs) / n if n else 0.0
+        dx = [x - self.kx for x, _ in pairs]
+        dy = [y - self.ky for _, y in pairs]
+        self.sx, self.sy = math.fsum(dx), math.fsum(dy)
+        self.sxx = math.fsum(a * a for a in dx)
+        self.syy = math.fsum(b * b for b in dy)
+        self.sxy = math.fsum(a * b for a, b in zip(dx, dy))
+        self.count, self.pushes = n, 0
+
+    def _add(self, x, y, sign):
+        a, b = x - self.kx, y - self.ky
+        self.sx += sign * a
+        self.sy += sign * b
+        self.sxx += sign * a * a
+        self.syy += sign * b * b
+        self.sxy += sign * a * b
+        self.count += sign
+
+    def push(self, x, y):
+        if len(self.buf) == self.window:
+            ox, oy = self.buf[0]
+            if not (math.isnan(ox) or math.isnan(oy)):
+                self._add(ox, oy, -1)
+        self.buf.append((x, y))
+        if not (math.isnan(x) or math.isnan(y)):
+            self._add(x, y, 1)
+        self.pushes += 1
+        if self.pushes >= REBASE_EVERY:
+            self._rebase()
+        n = self.count
+        if n < self.window:
+            return math.nan
+        vx = self.sxx - self.sx * self.sx / n
+        vy = self.syy - self.sy * self.sy / n
+        if vx <= 0 or vy <= 0:
+            return math.nan
+        return (self.sxy - self.sx * self.sy / n) / math.sqrt(vx * vy)
+
+
+# 증분 계산 파생 컬럼 → (상태 클래스, 창, 입력 컬럼)
+_STATE = {
+    "Liq_MA": (_RollingMean, MA_WINDOW, ("Liquidity",)),
+    "SP_MA": (_RollingMean, MA_WINDOW, ("SP500",)),
+    "Liq_YoY": (_RollingYoY, YOY_LAG, ("Liquidity",)),
+    "SP_YoY": (_RollingYoY, YOY_LAG, ("SP500",)),
+    "Corr_90d": (_RollingCorr, CORR_WINDOW, ("Liquidity", "SP500")),
+}
+_BASE_COLS = ["Liquidity", "SP500"]
+
+
+class RollingEngine:
+    """Liquidity · SP500 기본 시계열과 파생 컬럼을 누적 보관하는 증분 계산기 (스레드 안전)
+
+    인덱스(int64)와 값(행 × [Liquidity, SP500, 파생…])은 여유 용량을 둔 배열에 보관합니다.
+    봉 추가는 끝에 쓰기만 하고(분할 상환 O(1)), 앞쪽 자르기는 시작 위치만 옮기며,
+    기존 구간 확인은 시작 시점과 최근 RECHECK_ROWS행만 비교합니다.
+    파생 컬럼은 요청된 것만 계산하고, 요청이 늘면 한 번 재구성합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild(pd.DataFrame({c: [] for c in _BASE_COLS}, index=pd.DatetimeIndex([])), ())
+
+    # ── 초기화: pandas 전체 계산 1회 + 창 꼬리로 상태 복원 ──
+    def _rebuild(self, base, columns):
+        self.columns = [c for c in _STATE if c in columns]
+        src = {c: base[c].to_numpy(dtype=float) for c in _BASE_COLS}
+        full = derive_full(base, self.columns)
+        self._dtype, self._name = base.index.dtype, base.index.name
+        self._ts = base.index.asi8.copy()
+        self._data = np.column_stack([src[c] for c in _BASE_COLS]
+                                     + [full[c].to_numpy(dtype=float) for c in self.columns])
+        self._lo, self._hi = 0, len(base)
+        self._state = []
+        for c in self.columns:
+            cls, window, inputs = _STATE[c]
+            self._state.append((cls(window, *(src[i] for i in inputs)),
+                                [_BASE_COLS.index(i) for i in inputs]))
+
+    def _reserve(self, extra):
+        """끝에 extra행을 쓸 자리 확보 — 부족하면 유효 구간을 앞으로 당기고 필요하면 두 배로 키움"""
+        if self._hi + extra <= len(self._ts):
+            return
+        n = self._hi - self._lo
+        cap = max(len(self._ts), 2 * (n + extra), 256)
+        ts, data = np.empty(cap, dtype=np.int64), np.empty((cap, self._data.shape[1]))
+        ts[:n], data[:n] = self._ts[self._lo:self._hi], self._data[self._lo:self._hi]
+        self._ts, self._data, self._lo, self._hi = ts, data, 0, n
+
+    # ── 봉 추가: 모든 파생값 봉당 O(1) 갱신 ──
+    def _extend(self, ts, vals):
+        self._reserve(len(ts))
+        for t, row in zip(ts, vals):
+            out = self._data[self._hi]
+            out[:2] = row
+            for k, (state, inputs) in enumerate(self._state):
+                out[2 + k] = state.push(*(row[i] for i in inputs))
+            self._ts[self._hi] = t
+            self._hi += 1
+
+    def update(self, base, columns=DERIVED_COLS):
+        """base(Liquidity, SP500)에 맞춰 상태 동기화 → 파생 컬럼(columns) DataFrame
+
+        기존 구간이 그대로면 새 봉만 추가하고, 최근 값이 바뀌었으면(FRED 수정치 등) 재구성합니다.
+        앞쪽이 잘린 경우(다운로드 시작일 이동) 시작 위치만 옮기고 이미 계산된 값은 유지합니다.
+        """
+        with self._lock:
+            wanted = [c for c in columns if not c.endswith("_norm")]
+            ts = base.index.asi8
+            vals = base[_BASE_COLS].to_numpy(dtype=float)
+            old = self._ts[self._lo:self._hi]
+            pos = int(old.searchsorted(ts[0])) if len(ts) else 0
+            n_old = len(old) - pos
+            k = min(n_old, RECHECK_ROWS)
+            same = (
+                set(wanted) <= set(self.columns)
+                and base.index.dtype == self._dtype
+                and 0 < n_old <= len(ts)
+                and old[pos] == ts[0]
+                and np.array_equal(old[-k:], ts[n_old - k:n_old])
+                and np.array_equal(self._data[self._hi - k:self._hi, :2], vals[n_old - k:n_old], equal_nan=True)
+            )
+            if not same:
+                self._rebuild(base, set(wanted) | set(self.columns))
+            else:
+                self._lo += pos
+                self._extend(ts[n_old:], vals[n_old:].tolist())
+            return self.frame(columns)
+
+    def frame(self, columns=DERIVED_COLS):
+        """파생 컬럼 사본 (정규화는 요청된 경우에만 현재 구간의 최소/최대로 한 번에 계산)"""
+        lo, hi = self._lo, self._hi
+        index = pd.DatetimeIndex(self._ts[lo:hi].copy(), dtype=self._dtype, name=self._name)
+        out = {}
+        for c in columns:
+            if c.endswith("_norm"):
+                v = self._data[lo:hi, _BASE_COLS.index(c[:-len("_norm")])]
+                finite = v[~np.isnan(v)]
+                out[c] = ((v - finite.min()) / (finite.max() - finite.min()) * 100 if finite.size
+                          else np.full(len(v), np.nan))
+            else:
+                out[c] = self._data[lo:hi, 2 + self.columns.index(c)].copy()
+        return pd.DataFrame(out, index=index)
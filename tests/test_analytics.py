@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import lead_lag_surface, lttb, rolling_corr_stacked
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    idx = pd.bdate_range("2020-01-01", periods=400)
+    x = pd.Series(np.cumsum(rng.normal(size=len(idx))) + 100, index=idx)
+    y = pd.Series(0.6 * x.to_numpy() + np.cumsum(rng.normal(size=len(idx))), index=idx)
+    return x, y
+
+
+@pytest.mark.parametrize("lag", [-12, 0, 8])
+def test_latest_matches_pandas(series, lag):
+    """latest = 시차별 마지막 유효 창의 상관 (음수 시차도 NaN이 아님)"""
+    x, y = series
+    windows, lags = (30, 60), (-12, 0, 8)
+    out = lead_lag_surface(x, y, windows, lags)
+    for j, w in enumerate(windows):
+        expected = x.shift(lag).rolling(w).corr(y).dropna().iloc[-1]
+        assert out["latest"][lags.index(lag), j] == pytest.approx(expected, abs=1e-9)
+
+
+def test_latest_end_skips_trailing_gap(series):
+    """끝부분이 결측이면 latest는 마지막으로 계산된 창의 값, latest_end는 그 창이 끝나는 행"""
+    x, y = series
+    y = y.copy()
+    y.iloc[-20:] = np.nan
+    windows, lags = (30,), (-12, 0, 8)
+    out = lead_lag_surface(x, y, windows, lags)
+    for i, lag in enumerate(lags):
+        expected = x.shift(lag).rolling(30).corr(y).dropna()
+        assert out["latest_end"][i, 0] == x.index.get_loc(expected.index[-1])
+        assert out["latest"][i, 0] == pytest.approx(expected.iloc[-1], abs=1e-9)
+
+
+def test_rolling_corr_stacked_matches_pandas(series):
+    """길이 · 거래일이 다른 쌍을 이어 붙여도 쌍별 rolling.corr와 같은 값 (경계를 넘는 창 없음)"""
+    x, y = series
+    pairs = [(x, y), (x.iloc[50:300], y.iloc[50:300] * 2), (x.iloc[:20], y.iloc[:20])]
+    for (px, py), got in zip(pairs, rolling_corr_stacked(pairs, 30)):
+        pd.testing.assert_series_equal(got, px.rolling(30).corr(py), check_exact=False, atol=1e-9,
+                                       check_names=False, check_freq=False)
+
+
+@pytest.mark.parametrize("n, n_out", [(3528, 1500), (3528, 600), (10, 4)])
+def test_lttb_keeps_ends_and_spikes(n, n_out):
+    """첫/마지막 점 포함, 증가하는 n_out개 위치, 구간마다 하나뿐인 급등 · 급락은 그대로 선택"""
+    rng = np.random.default_rng(1)
+    x = np.arange(n) * 86400.0
+    y = np.cumsum(rng.normal(size=n))
+    spikes = np.linspace(n // 10, n - n // 10, 3).astype(int)
+    y[spikes] += np.array([1, -1, 1]) * 1e3
+    out = lttb(x, y, n_out)
+    assert len(out) == n_out and out[0] == 0 and out[-1] == n - 1
+    assert (np.diff(out) > 0).all()
+    assert set(spikes) <= set(out)
+
+
+def test_lttb_small_input_untouched():
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from data_sources import DEFAULT_PUBLICATION_LAG_DAYS, PUBLICATION_LAG_DAYS, fred_components, publication_lag
+from markets import COUNTRY_CONFIG
+
+
+def test_composite_lag_is_slowest_component():
+    assert publication_lag("NETLIQ") == pd.Timedelta(days=max(PUBLICATION_LAG_DAYS[c]
+                                                              for c in ("WALCL", "WTREGEN", "RRPONTSYD")))
+
+
+def test_unknown_code_gets_default_lag():
+    """표에 없는 코드도 KeyError 없이 보수적인 기본 시차 (Daily Brief 백테스트가 깨지지 않음)"""
+    assert publication_lag("NOT_A_SERIES") == pd.Timedelta(days=DEFAULT_PUBLICATION_LAG_DAYS)
+    assert DEFAULT_PUBLICATION_LAG_DAYS >= max(PUBLICATION_LAG_DAYS.values())
+
+
+def test_configured_liquidity_codes_are_in_table():
+    """설정된 유동성 시리즈는 기본값이 아닌 실제 발표 시차를 씀"""
+    codes = fred_components([cfg["fred_liq"] for cfg in COUNTRY_CONFIG.values()])
+    assert set(codes) <= set(PUBLICATION_LAG_DAYS)
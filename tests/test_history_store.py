@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+import history_store
+from history_store import _delta_start, _merge, overlap_for, sync
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "STORE_DIR", tmp_path)
+    return tmp_path
+
+
+def frame(start, periods, value=1.0, freq="D"):
+    idx = pd.date_range(start, periods=periods, freq=freq)
+    return pd.DataFrame({"v": [value] * periods}, index=idx)
+
+
+def test_merge_prefers_fresh_on_overlap():
+    merged = _merge(frame("2024-01-01", 10, 1.0), frame("2024-01-08", 5, 2.0))
+    assert merged.index.is_monotonic_increasing and not merged.index.has_duplicates
+    assert len(merged) == 12
+    assert (merged.loc["2024-01-08":, "v"] == 2.0).all() and (merged.loc[:"2024-01-07", "v"] == 1.0).all()
+    assert _merge(None, frame("2024-01-01", 3)).equals(frame("2024-01-01", 3))
+    assert _merge(frame("2024-01-01", 3), None).equals(frame("2024-01-01", 3))
+
+
+def test_delta_start():
+    start = pd.Timestamp("2020-01-01")
+    a, b = frame("2020-01-01", 1500), frame("2020-01-01", 1400)
+    # 저장본 중 가장 이른 마지막 날짜 − 겹침
+    assert _delta_start([a, b], start, 10) == b.index.max() - pd.Timedelta(days=10)
+    # 저장본이 없거나 시작이 요청보다 훨씬 늦으면 전체
+    assert _delta_start([a, None], start, 10) == start
+    assert _delta_start([frame("2021-01-01", 100)], start, 10) == start
+    # 겹침이 저장 구간보다 길어도 요청 시작일 이전으로는 가지 않음
+    assert _delta_start([frame("2020-01-01", 5)], start, 90) == start
+
+
+def test_overlap_per_provider():
+    assert overlap_for(["fred/WALCL"]) == history_store.OVERLAP_DAYS["fred"] >= 90
+    assert overlap_for(["yahoo/^GSPC"]) == history_store.OVERLAP_DAYS["yahoo"]
+    assert overlap_for(["yahoo/^GSPC", "fred/WALCL"]) == history_store.OVERLAP_DAYS["fred"]
+    assert overlap_for(["other/x"]) == history_store.DEFAULT_OVERLAP_DAYS
+
+
+def test_sync_fetches_delta_and_stores_revisions():
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-12-31")
+    calls = []
+
+    def fetch(since, until):
+        calls.append(since)
+        return {"fred/A": frame(since, (until - since).days + 1, 2.0)}
+
+    history_store.write("fred/A", frame("2024-01-01", 300, 1.0))
+    out = sync(["fred/A"], fetch, start, end)
+    last_stored = pd.Timestamp("2024-01-01") + pd.Timedelta(days=299)
+    # FRED 겹침 구간(90일)의 수정치가 저장본을 덮어씀
+    assert calls == [last_stored - pd.Timedelta(days=90)]
+    v = out["fred/A"]["v"]
+    assert (v[v.index >= calls[0]] == 2.0).all() and (v[v.index < calls[0]] == 1.0).all()
+    assert history_store.read("fred/A").equals(history_store._merge(frame("2024-01-01", 300, 1.0),
+                                                                    frame(calls[0], (end - calls[0]).days + 1, 2.0)))
+
+
+def test_sync_missing_key():
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")
+    fetch = lambda since, until: {"fred/A": frame(since, 31)}
+    assert list(sync(["fred/A", "fred/B"], fetch, start, end)) == ["fred/A"]
+    with pytest.raises(LookupError, match="fred/B"):
+        sync(["fred/A", "fred/B"], fetch, start, end, required=True)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import LAZY_COLS, FootprintLog, lazy_indicator
+from rolling_stats import derive_full
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(5)
+    idx = pd.bdate_range("2018-01-01", periods=800)
+    return pd.DataFrame({"Liquidity": np.cumsum(rng.normal(size=len(idx))) + 3000,
+                         "SP500": np.exp(np.cumsum(rng.normal(0, 0.01, size=len(idx)))) * 2000}, index=idx)
+
+
+@pytest.mark.parametrize("name", list(LAZY_COLS))
+def test_lazy_indicator_matches_full(frame, name):
+    """등록된 dtype으로 보관하되 값은 전체 재계산과 (float32 정밀도 안에서) 같음"""
+    got = lazy_indicator(name, frame)
+    assert got.dtype == np.dtype(LAZY_COLS[name])
+    pd.testing.assert_series_equal(got.astype("float64"), derive_full(frame, [name])[name], check_exact=False,
+                                   rtol=1e-6, check_names=False, check_freq=False)
+
+
+def test_footprint_keeps_recent_entries(frame):
+    """최근 max_entries개만 남고, 다시 기록한 항목은 최신으로"""
+    log = FootprintLog(max_entries=2)
+    s = lazy_indicator("SP_MA", frame)
+    for key in ["a", "b", "a", "c"]:
+        log.record((key,), s)
+    rows = log.rows()
+    assert [r["항목"] for r in rows] == ["a", "c"]
+    assert rows[0]["KB"] == round(len(frame) * 4 / 1024, 1)
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, ProviderError, call
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff", lambda attempt, base=0, cap=0: 0.0)
+
+
+def flaky(failures, result="ok"):
+    """처음 failures번은 IOError, 이후 result"""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise IOError("down")
+        return result
+    return fn, calls
+
+
+def test_breaker_opens_then_half_opens_then_closes():
+    clock = Clock()
+    b = CircuitBreaker("t", failures=3, cooldown=10, clock=clock)
+    for _ in range(2):
+        b.failure()
+    assert b.allow() and b.status()["상태"] == "closed"
+    b.failure()
+    assert not b.allow() and b.status()["상태"] == "open" and b.retry_in() == 10
+    clock.now = 10
+    assert b.allow() and b.status()["상태"] == "half-open"
+    assert not b.allow()  # 시험 요청은 하나만
+    b.success()
+    assert b.allow() and b.status() == {"제공자": "t", "상태": "closed", "연속 실패": 0}
+
+
+def test_failed_trial_reopens():
+    clock = Clock()
+    b = CircuitBreaker("t", failures=3, cooldown=10, clock=clock)
+    for _ in range(3):
+        b.failure()
+    clock.now = 10
+    assert b.allow()
+    b.failure()
+    assert not b.allow() and b.retry_in() == 10
+
+
+def test_call_retries_until_success():
+    fn, calls = flaky(2)
+    b = CircuitBreaker("retry")
+    assert call(fn, b, timeout=5, retries=2) == "ok"
+    assert len(calls) == 3 and b.status()["연속 실패"] == 0
+
+
+def test_call_exhausted_records_one_failure():
+    fn, calls = flaky(10)
+    b = CircuitBreaker("exhausted")
+    with pytest.raises(ProviderError, match="down"):
+        call(fn, b, timeout=5, retries=2)
+    assert len(calls) == 3 and b.status()["연속 실패"] == 1
+
+
+def test_call_blocked_does_not_run():
+    fn, calls = flaky(0)
+    b = CircuitBreaker("blocked", failures=1)
+    b.failure()
+    with pytest.raises(ProviderError, match="차단"):
+        call(fn, b)
+    assert calls == []
+
+
+def test_timed_out_attempt_is_retried_within_deadline():
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)  # 첫 시도는 응답 없음
+        return "ok"
+
+    t0 = time.monotonic()
+    assert call(fn, CircuitBreaker("slow"), timeout=1.0, retries=1) == "ok"
+    assert time.monotonic() - t0 < 0.9 and len(calls) == 2
+    release.set()
+
+
+def test_deadline_bounds_total_wait():
+    release = threading.Event()
+    b = CircuitBreaker("hang")
+    t0 = time.monotonic()
+    with pytest.raises(ProviderError, match="TimeoutError"):
+        call(lambda: release.wait(5), b, timeout=0.6, retries=2)
+    assert time.monotonic() - t0 < 1.0 and b.status()["연속 실패"] == 1
+    release.set()
+
+
+def test_hanging_provider_does_not_starve_others():
+    """한 제공자의 작업 스레드가 모두 묶여도 다른 제공자 호출은 바로 실행"""
+    release = threading.Event()
+    hung = CircuitBreaker("hung", failures=100)
+    for _ in range(resilience.PROVIDER_WORKERS):
+        with pytest.raises(ProviderError):
+            call(lambda: release.wait(5), hung, timeout=0.05, retries=0)
+    t0 = time.monotonic()
+    assert call(lambda: "ok", CircuitBreaker("healthy"), timeout=1.0, retries=0) == "ok"
+    assert time.monotonic() - t0 < 0.5
+    release.set()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_stats import DERIVED_COLS, RollingEngine, derive_full
+
+
+@pytest.fixture
+def base():
+    rng = np.random.default_rng(3)
+    idx = pd.bdate_range("2015-01-01", periods=1500)
+    liq = pd.Series(np.cumsum(rng.normal(size=len(idx))) + 3000, index=idx)
+    liq.iloc[::37] = np.nan
+    sp = pd.Series(np.exp(np.cumsum(rng.normal(0, 0.01, size=len(idx)))) * 2000, index=idx)
+    return pd.DataFrame({"Liquidity": liq, "SP500": sp})
+
+
+def assert_matches(engine, base):
+    out = engine.update(base, DERIVED_COLS)
+    expected = derive_full(base)
+    assert out.index.equals(base.index)
+    pd.testing.assert_frame_equal(out, expected[DERIVED_COLS], check_exact=False, rtol=1e-9, atol=1e-9,
+                                  check_freq=False)
+
+
+def test_incremental_matches_full(base):
+    """봉을 나눠 추가해도 전체 재계산과 같은 값"""
+    engine = RollingEngine()
+    for end in (600, 601, 900, 1500):
+        assert_matches(engine, base.iloc[:end])
+
+
+def test_front_trim_keeps_values(base):
+    """앞쪽이 잘리고 새 봉이 붙은 경우 — 잘린 이후 구간은 원래 이력으로 계산한 값 그대로"""
+    engine = RollingEngine()
+    engine.update(base.iloc[:1200], DERIVED_COLS)
+    out = engine.update(base.iloc[100:1300], ["Liq_MA", "Liq_YoY", "SP_YoY", "Corr_90d"])
+    expected = derive_full(base.iloc[:1300]).iloc[100:]
+    assert out.index.equals(base.index[100:1300])
+    pd.testing.assert_frame_equal(out, expected[out.columns], check_exact=False, rtol=1e-9, atol=1e-9,
+                                  check_freq=False)
+
+
+def test_recent_revision_rebuilds(base):
+    """최근 값이 바뀌면(수정치) 재구성"""
+    engine = RollingEngine()
+    engine.update(base.iloc[:1000], DERIVED_COLS)
+    revised = base.iloc[:1010].copy()
+    revised.iloc[990, 0] += 50
+    assert_matches(engine, revised)
@@ -0,0 +1,104 @@
+"""
+단계별 소요 시간 계측 — span()으로 감싼 구간의 소요(ms) · 캐시 히트/미스를 구조화 로그(JSON 한 줄)로 남기고,
+현재 실행(start_run ~ stop_run)의 기록을 디버그 패널에 넘깁니다.
+
+수집 중이 아니고 LIQ_TRACE=1도 아니면 span()은 공유 no-op 컨텍스트를 돌려주므로 비용이 거의 없습니다.
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+
+LOG_ENV = "LIQ_TRACE"   # 1이면 디버그 패널과 무관하게 모든 span을 로그로 출력 (백그라운드 스레드 포함)
+
+logger = logging.getLogger("liquidity.trace")
+_LOG_ALL = os.environ.get(LOG_ENV) == "1"
+if _LOG_ALL:
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+_records = contextvars.ContextVar("trace_records", default=None)  # 현재 실행의 기록 (list, 공유)
+_stack = contextvars.ContextVar("trace_stack", default=())         # 열린 span 기록 (tuple, 컨텍스트별)
+
+
+class _Noop:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Span:
+    def __init__(self, name, cached, fields):
+        self.rec = {"span": name, **fields}
+        if cached:
+            self.rec["cache"] = "hit"  # 캐시 함수 본문이 실행되면 mark_miss()가 miss로 바꿈
+
+    def __enter__(self):
+        stack = _stack.get()
+        self.rec["depth"] = len(stack)
+        records = _records.get()
+        if records is not None:
+            records.append(self.rec)  # 시작 순서대로 (소요는 종료 시 채움)
+        self._token = _stack.set(stack + (self.rec,))
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.rec["ms"] = round((time.perf_counter() - self._t0) * 1000, 2)
+        if exc_type is not None:
+            self.rec["error"] = exc_type.__name__
+        _stack.reset(self._token)
+        logger.info(json.dumps(self.rec, ensure_ascii=False, default=str))
+        return False
+
+
+def active():
+    """계측 중인지 (페이로드 크기처럼 따로 비용이 드는 값은 이때만 계산)"""
+    return _LOG_ALL or _records.get() is not None
+
+
+def span(name, cached=False, **fields):
+    """with span("load_data", cached=True): ... — cached=True면 캐시 히트/미스를 기록"""
+    if not active():
+        return _NOOP
+    return _Span(name, cached, fields)
+
+
+def mark_miss():
+    """캐시 함수 본문 첫 줄에서 호출 → 가장 가까운 cached span을 miss로 표시"""
+    for rec in reversed(_stack.get()):
+        if "cache" in rec:
+            rec["cache"] = "miss"
+            return
+
+
+def note(**fields):
+    """현재 span에 값 추가 (예: 페이로드 크기)"""
+    stack = _stack.get()
+    if stack:
+        stack[-1].update(fields)
+
+
+def start_run():
+    """현재 컨텍스트(스크립트 실행)의 기록 수집 시작"""
+    _records.set([])
+
+
+def stop_run():
+    """수집 종료 → 기록 목록"""
+    records = _records.get() or []
+    _records.set(None)
+    return records
+
+
+def propagate(fn):
+    """스레드 풀에 넘길 함수를 현재 컨텍스트로 감쌈 → 작업 스레드의 span도 같은 실행에 기록"""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)